@@ -17,8 +17,16 @@ st.set_page_config(
 from ui.candidate_mode import render_candidate_mode
 from ui.recruiter_mode import render_recruiter_mode
 from ui.components import show_api_key_input
-from utils.helpers import load_analysis_history, delete_analysis, format_date, truncate_text
-from utils.config import AVAILABLE_MODELS
+from utils.helpers import (
+    count_analyses,
+    list_analysis_summaries,
+    get_analysis,
+    delete_analysis,
+    clear_analysis_history,
+    format_date,
+    truncate_text
+)
+from utils.config import AVAILABLE_MODELS, HISTORY_PAGE_SIZE
 
 # CSS personnalisé
 st.markdown("""
@@ -97,27 +105,54 @@ with st.sidebar:
     # Historique
     st.markdown("### 📚 Historique")
     
-    history = load_analysis_history()
+    # Compte et résumés seulement: les analyses complètes restent en base
+    history_count = count_analyses()
     
-    if history:
-        st.caption(f"{len(history)} analyse(s) sauvegardée(s)")
+    if history_count:
+        st.caption(f"{history_count} analyse(s) sauvegardée(s)")
         
         if st.button("🗑️ Effacer tout l'historique", use_container_width=True):
-            for item in history:
-                delete_analysis(item['id'])
+            clear_analysis_history()
+            st.session_state.history_pages = 1
             st.rerun()
         
         st.markdown("---")
         
-        # Afficher les 5 dernières analyses
-        for item in history[:5]:
-            with st.expander(f"📄 {truncate_text(item.get('cv_name', 'Analyse'), 25)}"):
-                st.caption(f"📅 {format_date(item.get('timestamp', ''))}")
-                st.metric("Score", f"{item.get('score', 0)}/100")
-                
-                if st.button("❌ Supprimer", key=f"del_{item['id']}"):
-                    delete_analysis(item['id'])
-                    st.rerun()
+        # Pages de résumés, chargées à la demande ("Voir plus")
+        history_pages = st.session_state.get('history_pages', 1)
+        cursor = None
+        
+        for _ in range(history_pages):
+            items, cursor = list_analysis_summaries(limit=HISTORY_PAGE_SIZE, cursor=cursor)
+            
+            for item in items:
+                with st.expander(f"📄 {truncate_text(item.get('cv_name') or 'Analyse', 25)}"):
+                    st.caption(f"📅 {format_date(item.get('timestamp', ''))}")
+                    st.metric("Score", f"{item.get('score') or 0}/100")
+                    
+                    # L'analyse complète n'est lue qu'à la demande
+                    open_key = f"history_open_{item['id']}"
+                    if st.session_state.get(open_key):
+                        record = get_analysis(item['id']) or {}
+                        analysis = record.get('analysis', {})
+                        if analysis.get('synthese'):
+                            st.markdown(f"**Synthèse:** {analysis['synthese']}")
+                        for point in analysis.get('points_forts', [])[:3]:
+                            st.markdown(f"✅ {point}")
+                    elif st.button("📖 Voir l'analyse", key=f"open_{item['id']}"):
+                        st.session_state[open_key] = True
+                        st.rerun()
+                    
+                    if st.button("❌ Supprimer", key=f"del_{item['id']}"):
+                        delete_analysis(item['id'])
+                        st.rerun()
+            
+            if cursor is None:
+                break
+        
+        if cursor and st.button("⬇️ Voir plus", use_container_width=True):
+            st.session_state.history_pages = history_pages + 1
+            st.rerun()
     else:
         st.info("Aucune analyse enregistrée")
     
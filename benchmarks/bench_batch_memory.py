@@ -0,0 +1,80 @@
+"""
+Benchmark: pic de mémoire (RSS) pendant l'extraction d'un lot de CVs
+
+Usage:
+    python benchmarks/bench_batch_memory.py [nombre_de_cvs] [pages_par_cv]
+
+Trois scénarios, chacun dans un processus neuf pour isoler le pic RSS:
+- "octets": les CVs sont en mémoire et transmis aux processus
+  d'extraction par mémoire partagée
+- "uploads": idem, chaque CV dans un io.BytesIO (comme l'UploadedFile
+  de Streamlit)
+- "fichiers": les CVs sont dans UPLOADS_DIR et mappés en mémoire par les
+  processus d'extraction
+Le cache d'extraction est désactivé.
+"""
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ["EXTRACTION_CACHE_ENABLED"] = "false"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pdf_parsing import build_cv_pdf
+from src.document_extractors import extract_documents
+from utils.config import UPLOADS_DIR
+
+def peak_rss_mb(who: int) -> float:
+    # ru_maxrss est en KB sous Linux, en octets sous macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def run_scenario(scenario: str, num_cvs: int, num_pages: int):
+    # Contenu distinct par CV: numéro de page différent dans chaque document
+    documents = [build_cv_pdf(num_pages + i % 3) for i in range(num_cvs)]
+    payload_mb = sum(len(d) for d in documents) / 1024 / 1024
+
+    with tempfile.TemporaryDirectory(dir=UPLOADS_DIR) as directory:
+        if scenario == "fichiers":
+            paths = []
+            for i, data in enumerate(documents):
+                path = Path(directory) / f"cv_{i}.pdf"
+                path.write_bytes(data)
+                paths.append(str(path))
+            del documents
+            inputs = paths
+        elif scenario == "uploads":
+            # Streamlit garde les octets de l'upload: le BytesIO les partage
+            inputs = [io.BytesIO(data) for data in documents]
+        else:
+            inputs = documents
+
+        baseline = peak_rss_mb(resource.RUSAGE_SELF)
+        start = time.perf_counter()
+        errors = sum(1 for result in extract_documents(inputs) if result['error'])
+        elapsed = time.perf_counter() - start
+
+    print(f"{scenario:<9} {num_cvs} CVs ({payload_mb:.1f} MB)  {elapsed:6.1f} s  "
+          f"pic parent {peak_rss_mb(resource.RUSAGE_SELF):6.1f} MB (avant lot {baseline:.1f})  "
+          f"pic worker {peak_rss_mb(resource.RUSAGE_CHILDREN):6.1f} MB  erreurs {errors}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--scenario":
+        run_scenario(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        return
+
+    num_cvs = sys.argv[1] if len(sys.argv) > 1 else "100"
+    num_pages = sys.argv[2] if len(sys.argv) > 2 else "2"
+    for scenario in ("octets", "uploads", "fichiers"):
+        subprocess.run(
+            [sys.executable, __file__, "--scenario", scenario, num_cvs, num_pages],
+            check=True
+        )
+
+if __name__ == "__main__":
+    main()
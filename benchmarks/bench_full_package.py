@@ -0,0 +1,81 @@
+"""
+Benchmark: parcours candidat en trois appels vs mode complet (un appel)
+
+Usage:
+    python benchmarks/bench_full_package.py chemin/cv.pdf chemin/offre.txt
+
+Sans GROQ_API_KEY, seule la taille des prompts envoyés est comparée
+(estimation locale des tokens). Avec une clé, les deux parcours sont
+exécutés réellement (cache de réponses désactivé) et les tokens facturés
+ainsi que le temps total sont mesurés.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+# Mesurer de vrais appels, pas des réponses en cache
+os.environ["LLM_CACHE_ENABLED"] = "false"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai_analyzer import CVAnalyzer
+from src.pdf_processor import PDFProcessor
+from src.text_compactor import estimate_tokens
+from utils.config import GROQ_API_KEY, DEFAULT_MODEL
+
+def estimate_prompt_tokens(cv_text: str, job_offer: str) -> dict:
+    """Taille estimée des prompts de chaque parcours"""
+    # Aucun appel réseau: seule la construction des prompts est utilisée
+    analyzer = CVAnalyzer("gsk_offline", model=DEFAULT_MODEL, test_connection=False)
+    analysis_stub = {'score_global': 70, 'points_forts': ["x"] * 4,
+                     'competences_techniques': {'manquantes': ["x"] * 5}}
+    three_calls = [
+        analyzer._build_analysis_prompt(cv_text, job_offer),
+        analyzer._build_cover_letter_prompt(cv_text, job_offer, analysis_stub),
+        analyzer._build_suggestions_prompt(cv_text, job_offer, analysis_stub)
+    ]
+    one_call = [analyzer._build_full_package_prompt(cv_text, job_offer)]
+
+    return {
+        "3 appels": sum(estimate_tokens(p) for p in three_calls),
+        "mode complet": sum(estimate_tokens(p) for p in one_call)
+    }
+
+def run_three_calls(analyzer: CVAnalyzer, cv_text: str, job_offer: str):
+    analysis = analyzer.analyze_cv_matching(cv_text, job_offer)
+    analyzer.generate_cover_letter(cv_text, job_offer, analysis)
+    analyzer.generate_improvement_suggestions(cv_text, job_offer, analysis)
+
+def run_full_package(analyzer: CVAnalyzer, cv_text: str, job_offer: str):
+    analyzer.generate_full_package(cv_text, job_offer)
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(sys.argv[1], 'rb') as f:
+        cv_text = PDFProcessor.extract_text(f)
+    job_offer = Path(sys.argv[2]).read_text(encoding='utf-8')
+
+    print("Tokens d'entrée estimés:")
+    for name, tokens in estimate_prompt_tokens(cv_text, job_offer).items():
+        print(f"  {name:<14} ~{tokens}")
+
+    if not GROQ_API_KEY:
+        print("\nGROQ_API_KEY absente: mesure réelle ignorée")
+        return
+
+    print(f"\nMesure réelle ({DEFAULT_MODEL}):")
+    print(f"  {'parcours':<14} {'appels':>6} {'entrée':>8} {'sortie':>8} {'durée':>8}")
+    for name, run in [("3 appels", run_three_calls), ("mode complet", run_full_package)]:
+        analyzer = CVAnalyzer(GROQ_API_KEY, model=DEFAULT_MODEL, test_connection=False)
+        start = time.perf_counter()
+        run(analyzer, cv_text, job_offer)
+        elapsed = time.perf_counter() - start
+        usage = analyzer.usage
+        print(f"  {name:<14} {usage['calls']:>6} {usage['prompt_tokens']:>8} "
+              f"{usage['completion_tokens']:>8} {elapsed:>7.1f}s")
+
+if __name__ == "__main__":
+    main()
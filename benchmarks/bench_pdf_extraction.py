@@ -0,0 +1,72 @@
+"""
+Benchmark: extraction pdfplumber (comportement historique) vs modes adaptatif et colonnes
+
+Usage:
+    python benchmarks/bench_pdf_extraction.py cv1.pdf [cv2.pdf ...]
+
+Pour chaque méthode: débit (pages/s), score de qualité moyen par page
+(extraction_quality.page_quality) et similarité des mots extraits avec la
+sortie pdfplumber. Le cache d'extraction est désactivé pour mesurer de
+vraies extractions.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ["EXTRACTION_CACHE_ENABLED"] = "false"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.extraction_quality import get_adaptive_stats, page_quality
+from src.parsed_pdf import ParsedPDF
+
+METHODS = ["pdfplumber", "adaptive", "columns"]
+
+def extract_pages(data: bytes, method: str) -> list:
+    """Texte de chaque page, avec un document neuf (aucun cache partagé)"""
+    with ParsedPDF(data) as pdf:
+        return [pdf.page_text(i, method) for i in range(pdf.num_pages)]
+
+def word_similarity(reference: list, candidate: list) -> float:
+    """Part des mots de la référence retrouvés dans le texte candidat"""
+    reference_words = set(" ".join(reference).split())
+    candidate_words = set(" ".join(candidate).split())
+    if not reference_words:
+        return 1.0
+    return len(reference_words & candidate_words) / len(reference_words)
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    documents = [Path(path).read_bytes() for path in sys.argv[1:]]
+    results = {}
+
+    for method in METHODS:
+        start = time.perf_counter()
+        pages = [extract_pages(data, method) for data in documents]
+        elapsed = time.perf_counter() - start
+
+        all_pages = [page for document in pages for page in document]
+        results[method] = {
+            "pages": pages,
+            "seconds": elapsed,
+            "pages_per_second": len(all_pages) / elapsed if elapsed else 0.0,
+            "quality": sum(page_quality(p) for p in all_pages) / max(1, len(all_pages))
+        }
+
+    reference = results["pdfplumber"]["pages"]
+    for method, result in results.items():
+        similarity = sum(
+            word_similarity(ref, cand) for ref, cand in zip(reference, result["pages"])
+        ) / len(documents)
+        print(f"{method:<12} {result['seconds']:7.2f} s   {result['pages_per_second']:7.1f} pages/s   "
+              f"qualité {result['quality']:.2f}   mots communs avec pdfplumber {similarity:.0%}")
+
+    stats = get_adaptive_stats()
+    print(f"\nMode adaptatif: {stats['fast_path']}/{stats['pages']} pages par le chemin rapide "
+          f"({stats['fast_path_rate']:.0%}), {stats['fallback']} ré-extraites avec pdfplumber")
+
+if __name__ == "__main__":
+    main()
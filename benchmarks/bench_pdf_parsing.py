@@ -0,0 +1,106 @@
+"""
+Benchmark: parsing répété d'un upload vs document parsé une seule fois
+
+Usage:
+    python benchmarks/bench_pdf_parsing.py [nombre_de_pages] [répétitions]
+
+Un CV multi-pages est généré avec reportlab, puis le parcours d'un upload
+candidat (infos, validation, extraction) est mesuré de deux façons:
+l'ancien parcours, qui ouvre le PDF à chaque étape, et ParsedPDF, qui
+l'ouvre une fois. Temps moyen et pic mémoire (tracemalloc) sont affichés.
+"""
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import PyPDF2
+import pdfplumber
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.pdf_processor import PDFProcessor
+
+def build_cv_pdf(num_pages: int) -> bytes:
+    """CV factice: titres de sections et lignes d'expérience sur chaque page"""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    for page in range(num_pages):
+        y = height - 60
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(50, y, f"EXPÉRIENCE PROFESSIONNELLE ({page + 1})")
+        pdf.setFont("Helvetica", 10)
+        for line in range(45):
+            y -= 15
+            pdf.drawString(50, y, f"Développeur Python - Projet {page}.{line}: API REST, Docker, PostgreSQL")
+        pdf.drawString(width / 2, 30, f"Page {page + 1} / {num_pages}")
+        pdf.showPage()
+
+    pdf.save()
+    return buffer.getvalue()
+
+def legacy_upload(data: bytes) -> str:
+    """Ancien parcours: get_pdf_info, validate_pdf puis extract_text parsent chacun le PDF"""
+    upload = io.BytesIO(data)
+
+    reader = PyPDF2.PdfReader(upload)
+    _ = (len(reader.pages), reader.is_encrypted)
+    upload.seek(0)
+
+    if len(PyPDF2.PdfReader(upload).pages) == 0:
+        raise ValueError("PDF vide")
+    upload.seek(0)
+
+    text = ""
+    with pdfplumber.open(upload) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text.strip()
+
+def parsed_upload(data: bytes) -> str:
+    """Nouveau parcours: un seul ParsedPDF partagé par les trois étapes"""
+    with PDFProcessor.parse(data) as parsed:
+        PDFProcessor.get_pdf_info(parsed)
+        PDFProcessor.validate_pdf(parsed)
+        return PDFProcessor.extract_text(parsed, method="pdfplumber")
+
+def measure(func, data: bytes, repeats: int) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        text = func(data)
+    elapsed = (time.perf_counter() - start) / repeats
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": elapsed, "peak_mb": peak / 1024 / 1024, "chars": len(text)}
+
+def main():
+    num_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    data = build_cv_pdf(num_pages)
+    print(f"CV généré: {num_pages} pages, {len(data) / 1024:.0f} KB, {repeats} répétitions\n")
+
+    results = {
+        "parsing répété": measure(legacy_upload, data, repeats),
+        "ParsedPDF": measure(parsed_upload, data, repeats)
+    }
+
+    for label, result in results.items():
+        print(f"{label:<16} {result['seconds'] * 1000:8.1f} ms   "
+              f"pic {result['peak_mb']:6.1f} MB   {result['chars']} caractères")
+
+    before, after = results["parsing répété"], results["ParsedPDF"]
+    print(f"\nTemps: -{100 * (1 - after['seconds'] / before['seconds']):.0f}%   "
+          f"Mémoire: -{100 * (1 - after['peak_mb'] / before['peak_mb']):.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,349 @@
 """
 Logique d'analyse IA avec Groq
 """
-import json
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from groq import Groq
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 from src.prompt_templates import (
     SYSTEM_PROMPT,
     ANALYSIS_PROMPT,
     COVER_LETTER_PROMPT,
     SUGGESTIONS_PROMPT,
-    RECRUITER_ANALYSIS_PROMPT
+    FULL_PACKAGE_PROMPT,
+    CANDIDATE_SCORING_PROMPT,
+    RANKING_SYNTHESIS_PROMPT,
+    REPAIR_JSON_PROMPT,
+    TRIAGE_PROMPT
+)
+from src.cv_sections import select_sections
+from src.json_stream import JSONObjectStreamParser
+from src.keyword_scorer import keyword_score
+from src.rate_limiter import get_scheduler
+from src.response_cache import RESPONSE_CACHE, make_cache_key
+from src.structured_output import (
+    StructuredOutputError,
+    parse_json_response,
+    validate_analysis,
+    record_repair_retry,
+    _as_str_list,
+    _parse_score
+)
+from src.text_compactor import compact_text, estimate_tokens
+from utils.config import (
+    MAX_PARALLEL_REQUESTS,
+    SYNTHESIS_TOP_N,
+    CV_TOKEN_BUDGET,
+    JOB_OFFER_TOKEN_BUDGET,
+    MODEL_CONTEXT_TOKENS,
+    JSON_MODE_MODELS,
+    TRIAGE_MODEL,
+    CASCADE_TOP_K,
+    TRIAGE_CV_TOKEN_BUDGET
 )
 
-class CVAnalyzer:
+# Sections du CV envoyées au modèle de tri (le reste ne change pas le score)
+TRIAGE_SECTIONS = {"profil", "competences", "experience", "formation"}
+
+class BaseCVAnalyzer:
+    """
+    Partie commune aux analyseurs synchrone et asynchrone:
+    construction des prompts et interprétation des réponses
+    """
+    
+    @staticmethod
+    def _validate_api_key(api_key: str):
+        """Vérifie le format de la clé API (sans appel réseau)"""
+        if not api_key or api_key.strip() == "":
+            raise ValueError("❌ Clé API Groq obligatoire. Entrez votre clé dans la barre latérale.")
+        
+        if not api_key.startswith("gsk_"):
+            raise ValueError("❌ Clé API invalide. Elle doit commencer par 'gsk_'")
+    
+    def _compact_inputs(self, cv_text: str, job_offer: str) -> tuple[str, str]:
+        """
+        Compacte le CV et l'offre selon le budget de tokens du modèle
+        
+        Le budget configuré est plafonné à une fraction de la fenêtre de
+        contexte du modèle pour laisser la place au prompt et à la réponse.
+        """
+        context = MODEL_CONTEXT_TOKENS.get(self.model, 8192)
+        cv_budget = min(CV_TOKEN_BUDGET, context // 2)
+        offer_budget = min(JOB_OFFER_TOKEN_BUDGET, context // 6)
+        
+        cv_text, _ = compact_text(cv_text, cv_budget)
+        job_offer, _ = compact_text(job_offer, offer_budget)
+        return cv_text, job_offer
+    
+    def _build_analysis_prompt(self, cv_text: str, job_offer: str) -> str:
+        cv_text, job_offer = self._compact_inputs(cv_text, job_offer)
+        return ANALYSIS_PROMPT.format(
+            cv_text=cv_text,
+            job_offer=job_offer
+        )
+    
+    @staticmethod
+    def _parse_analysis(response: str) -> Dict:
+        """Extrait et valide le JSON d'analyse de la réponse"""
+        return validate_analysis(parse_json_response(response, dict))
+    
+    def _build_cover_letter_prompt(self, cv_text: str, job_offer: str, analysis: Dict) -> str:
+        cv_text, job_offer = self._compact_inputs(cv_text, job_offer)
+        return COVER_LETTER_PROMPT.format(
+            cv_text=cv_text,
+            job_offer=job_offer,
+            score=analysis.get('score_global', 0),
+            strengths=", ".join(analysis.get('points_forts', []))[:200]
+        )
+    
+    def _build_suggestions_prompt(self, cv_text: str, job_offer: str, analysis: Dict) -> str:
+        cv_text, job_offer = self._compact_inputs(cv_text, job_offer)
+        missing_skills = analysis.get('competences_techniques', {}).get('manquantes', [])
+        
+        return SUGGESTIONS_PROMPT.format(
+            cv_text=cv_text,
+            job_offer=job_offer,
+            missing_skills=", ".join(missing_skills[:5]),
+            score=analysis.get('score_global', 0)
+        )
+    
+    @staticmethod
+    def _parse_suggestions(response: str, analysis: Dict) -> list:
+        """Parse la liste de suggestions (fallback sur l'analyse)"""
+        try:
+            suggestions = parse_json_response(response, list)
+            return [str(s) for s in suggestions if s][:5]
+        except StructuredOutputError:
+            # Fallback: retourner les suggestions du point_amelioration
+            return analysis.get('points_amelioration', [])[:5]
+    
+    def _build_full_package_prompt(self, cv_text: str, job_offer: str) -> str:
+        cv_text, job_offer = self._compact_inputs(cv_text, job_offer)
+        return FULL_PACKAGE_PROMPT.format(
+            cv_text=cv_text,
+            job_offer=job_offer
+        )
+    
+    @staticmethod
+    def _parse_full_package(response: str) -> Dict:
+        """Sépare la réponse combinée en analyse, suggestions et lettre"""
+        package = parse_json_response(response, dict)
+        analysis = validate_analysis(package.get('analyse'))
+        
+        # Une chaîne unique ou des éléments vides ne donnent pas de suggestions parasites
+        suggestions = _as_str_list(package.get('suggestions')) or analysis['points_amelioration']
+        
+        return {
+            'analysis': analysis,
+            'suggestions': suggestions[:5],
+            'cover_letter': str(package.get('lettre_motivation', '')).strip()
+        }
+    
+    def _build_scoring_prompt(self, cv: Dict, job_offer: str) -> str:
+        cv_text, job_offer = self._compact_inputs(cv['text'], job_offer)
+        return CANDIDATE_SCORING_PROMPT.format(
+            job_offer=job_offer,
+            candidate_name=cv['name'],
+            cv_text=cv_text
+        )
+    
+    @staticmethod
+    def _parse_scoring(response: str, cv: Dict) -> Dict:
+        """
+        Parse l'évaluation d'un CV et normalise ses champs
+        
+        Raises:
+            StructuredOutputError: score absent ou illisible (l'évaluation
+            est alors réparée, ou marquée en erreur, plutôt que notée 0)
+        """
+        evaluation = parse_json_response(response, dict)
+        
+        # Le nom du fichier fait foi, le modèle peut le reformuler
+        evaluation['candidat'] = cv['name']
+        score = _parse_score(evaluation.get('score'))
+        if score is None:
+            raise StructuredOutputError(f"Score invalide: {evaluation.get('score')!r}")
+        evaluation['score'] = score
+        evaluation.setdefault('points_forts', [])
+        evaluation.setdefault('reserves', [])
+        evaluation.setdefault('recommandation', 'À considérer')
+        
+        return evaluation
+    
+    @staticmethod
+    def _build_repair_prompt(response: str, error: Exception) -> tuple[str, int]:
+        """
+        Prompt de réparation: seule la réponse fautive est renvoyée au modèle
+        
+        Returns:
+            tuple: (prompt, max_tokens adapté à la taille de la réponse)
+        """
+        expected = "une liste JSON" if response.lstrip().startswith('[') else "un objet JSON"
+        prompt = REPAIR_JSON_PROMPT.format(
+            expected=expected,
+            error=str(error),
+            response=response
+        )
+        return prompt, min(4000, int(estimate_tokens(response) * 1.3) + 200)
+    
+    def _uses_json_mode(self, json_mode: bool) -> bool:
+        return json_mode and self.model in JSON_MODE_MODELS
+    
+    @staticmethod
+    def _is_usable(response: str, validate) -> bool:
+        if validate is None:
+            return True
+        try:
+            validate(response)
+            return True
+        except Exception:
+            return False
+    
+    def _cached_response(self, cache_key: Optional[str], validate=None) -> Optional[str]:
+        """Réponse en cache, écartée (et supprimée) si elle n'est pas interprétable"""
+        if not cache_key:
+            return None
+        cached = RESPONSE_CACHE.get(cache_key)
+        if cached is not None and not self._is_usable(cached, validate):
+            RESPONSE_CACHE.delete(cache_key)
+            return None
+        return cached
+    
+    def _cache_response(self, cache_key: Optional[str], content: str, validate=None):
+        """
+        Met une réponse en cache, seulement si `validate` l'accepte: une
+        réponse inexploitable n'est jamais resservie, relancer l'analyse
+        refait un vrai appel
+        """
+        if cache_key and content and self._is_usable(content, validate):
+            RESPONSE_CACHE.set(cache_key, content)
+    
+    def _build_triage_prompt(self, cv: Dict, job_offer: str) -> str:
+        # Le tri n'a besoin que de l'essentiel: sections clés, budget réduit
+        cv_text = select_sections(cv['text'], TRIAGE_SECTIONS)
+        cv_text, _ = compact_text(cv_text, TRIAGE_CV_TOKEN_BUDGET)
+        job_offer, _ = compact_text(job_offer, JOB_OFFER_TOKEN_BUDGET // 2)
+        return TRIAGE_PROMPT.format(
+            job_offer=job_offer,
+            cv_text=cv_text
+        )
+    
+    @staticmethod
+    def _parse_triage(response: str) -> int:
+        """Score de tri (0-100); un score absent ou illisible n'est jamais pris pour 0"""
+        triage = parse_json_response(response, dict)
+        score = _parse_score(triage.get('score'))
+        if score is None:
+            raise StructuredOutputError(f"Score de tri invalide: {triage.get('score')!r}")
+        return score
+    
+    @staticmethod
+    def _triage_evaluation(cv: Dict, score: int) -> Dict:
+        """Entrée de classement pour un CV écarté lors du tri rapide"""
+        return {
+            'candidat': cv['name'],
+            'score': score,
+            'points_forts': [],
+            'reserves': ["Non présélectionné lors du tri rapide (score indicatif)"],
+            'recommandation': 'Non retenu',
+            'preselection': False
+        }
+    
+    @staticmethod
+    def _error_evaluation(cv: Dict, error: Exception) -> Dict:
+        """Entrée de classement pour un CV dont l'évaluation a échoué"""
+        return {
+            'candidat': cv['name'],
+            'score': 0,
+            'points_forts': [],
+            'reserves': [f"Analyse impossible: {str(error)}"],
+            'recommandation': 'Non évalué',
+            'erreur': True
+        }
+    
+    @staticmethod
+    def _merge_rankings(evaluations: list) -> list:
+        """
+        Étape "reduce" du mode recruteur: trie les évaluations individuelles
+        
+        Tri par score décroissant, puis par recommandation, puis par nombre
+        de points forts; l'ordre d'upload départage les ex-aequo restants.
+        """
+        if all(e.get('erreur') for e in evaluations):
+            raise Exception(f"Erreur API Groq: aucun CV n'a pu être analysé "
+                            f"({evaluations[0]['reserves'][0]})")
+        
+        def recommendation_rank(evaluation: Dict) -> int:
+            recommandation = evaluation.get('recommandation', '').lower()
+            if "non retenu" in recommandation:
+                return 2
+            if "considérer" in recommandation:
+                return 1
+            if "recommandé" in recommandation:
+                return 0
+            return 1
+        
+        return sorted(
+            evaluations,
+            key=lambda e: (
+                -e.get('score', 0),
+                recommendation_rank(e),
+                -len(e.get('points_forts', []))
+            )
+        )
+    
+    @staticmethod
+    def _build_synthesis_prompt(classement: list, job_offer: str) -> str:
+        ranking_summary = "\n".join(
+            f"{i}. {c['candidat']} - {c['score']}/100 - {c.get('recommandation', '')} | "
+            f"+ {'; '.join(c.get('points_forts', [])[:2])} | "
+            f"- {'; '.join(c.get('reserves', [])[:2])}"
+            for i, c in enumerate(classement[:SYNTHESIS_TOP_N], 1)
+        )
+        
+        return RANKING_SYNTHESIS_PROMPT.format(
+            job_offer=job_offer,
+            ranking_summary=ranking_summary
+        )
+    
+    @staticmethod
+    def _fallback_synthesis(classement: list) -> str:
+        """Synthèse minimale si l'appel de synthèse échoue"""
+        best = classement[0]
+        return (f"{len(classement)} candidat(s) évalué(s). "
+                f"Meilleur profil: {best['candidat']} ({best['score']}/100).")
+
+class CVAnalyzer(BaseCVAnalyzer):
     """Analyseur de CV avec IA"""
     
-    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
+    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile",
+                 client: Optional[Groq] = None, test_connection: bool = True):
         """
         Initialise l'analyseur avec une clé API
         
         Args:
             api_key: Clé API Groq (OBLIGATOIRE)
             model: Modèle à utiliser
+            client: Client Groq existant à réutiliser (pool de connexions)
+            test_connection: Valider la clé par un appel minimal
         """
-        if not api_key or api_key.strip() == "":
-            raise ValueError("❌ Clé API Groq obligatoire. Entrez votre clé dans la barre latérale.")
-        
-        if not api_key.startswith("gsk_"):
-            raise ValueError("❌ Clé API invalide. Elle doit commencer par 'gsk_'")
+        self._validate_api_key(api_key)
         
         try:
-            self.client = Groq(api_key=api_key)
+            # Les retries sont gérés par l'ordonnanceur, pas par le client
+            self.client = client or Groq(api_key=api_key, max_retries=0)
             self.model = model
+            self.scheduler = get_scheduler(api_key, model)
+            
+            # Consommation cumulée (hors réponses servies par le cache)
+            self.usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+            self._usage_lock = threading.Lock()
             
             # Test de connexion rapide
-            self._test_connection()
+            if test_connection:
+                self._test_connection()
             
         except Exception as e:
             raise ValueError(f"❌ Erreur de connexion à Groq: {str(e)}")
@@ -42,36 +351,162 @@ class CVAnalyzer:
     def _test_connection(self):
         """Teste la connexion avec un appel minimal"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=5,
-                temperature=0
+            response = self.scheduler.execute(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": "test"}],
+                    max_tokens=5,
+                    temperature=0
+                ),
+                tokens=10
             )
             # Si on arrive ici, la clé est valide
         except Exception as e:
             raise ValueError(f"❌ Clé API invalide ou problème de connexion: {str(e)}")
     
-    def _call_groq(self, prompt: str, system_prompt: str = SYSTEM_PROMPT, 
-                   temperature: float = 0.3, 
-                   max_tokens: int = 4000) -> str:
+    def _call_groq(self, prompt: str, system_prompt: str = SYSTEM_PROMPT,
+                   temperature: float = 0.3,
+                   max_tokens: int = 4000,
+                   json_mode: bool = False,
+                   validate=None) -> str:
         """
         Appel générique à l'API Groq
+        
+        Les appels peu aléatoires (température basse) passent par le cache
+        de réponses: un prompt identique n'est envoyé qu'une fois.
+        Avec json_mode, le modèle est contraint à produire un objet JSON
+        quand il le permet (JSON_MODE_MODELS). `validate(réponse)` (le
+        parseur de l'appelant) décide si la réponse peut être mise en cache.
+        """
+        cache_key = make_cache_key(self.model, system_prompt, prompt, temperature, max_tokens)
+        cached = self._cached_response(cache_key, validate)
+        if cached is not None:
+            return cached
+        
+        options = {}
+        if self._uses_json_mode(json_mode):
+            options["response_format"] = {"type": "json_object"}
+        
+        try:
+            # Attente de quota et retries (429, 5xx, réseau) dans l'ordonnanceur
+            response = self.scheduler.execute(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **options
+                ),
+                tokens=estimate_tokens(system_prompt + prompt) + max_tokens
+            )
+            
+            content = response.choices[0].message.content.strip()
+        except Exception as e:
+            raise Exception(f"Erreur API Groq: {str(e)}")
+        
+        self._record_usage(response)
+        
+        self._cache_response(cache_key, content, validate)
+        return content
+    
+    def _for_model(self, model: str) -> "CVAnalyzer":
+        """
+        Copie de l'analyseur sur un autre modèle (même client HTTP et même clé)
+        
+        La copie a ses propres compteurs de consommation.
+        """
+        clone = copy.copy(self)
+        clone.model = model
+        clone.scheduler = get_scheduler(self.client.api_key, model)
+        clone.usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        clone._usage_lock = threading.Lock()
+        return clone
+    
+    def _record_usage(self, response):
+        """Ajoute les tokens d'une réponse aux compteurs de l'instance"""
+        usage = getattr(response, 'usage', None)
+        
+        with self._usage_lock:
+            self.usage["calls"] += 1
+            if usage is not None:
+                self.usage["prompt_tokens"] += usage.prompt_tokens or 0
+                self.usage["completion_tokens"] += usage.completion_tokens or 0
+    
+    def _stream_groq(self, prompt: str, system_prompt: str = SYSTEM_PROMPT,
+                     temperature: float = 0.3,
+                     max_tokens: int = 4000,
+                     validate=None) -> Iterator[str]:
+        """
+        Appel à l'API Groq en streaming: produit le texte au fil de l'eau
+        
+        Une réponse déjà en cache est produite en un seul morceau.
         """
+        cache_key = make_cache_key(self.model, system_prompt, prompt, temperature, max_tokens)
+        cached = self._cached_response(cache_key, validate)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens
+            # Seule l'ouverture du flux peut être retentée
+            stream = self.scheduler.execute(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True
+                ),
+                tokens=estimate_tokens(system_prompt + prompt) + max_tokens
             )
             
-            return response.choices[0].message.content.strip()
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
         except Exception as e:
             raise Exception(f"Erreur API Groq: {str(e)}")
+        
+        self._record_usage(None)
+        
+        self._cache_response(cache_key, "".join(chunks).strip(), validate)
+    
+    def _parse_with_repair(self, response: str, parse, *args):
+        """
+        Interprète une réponse structurée, avec un appel de réparation en secours
+        
+        Si le parsing local échoue, seule la réponse fautive est renvoyée au
+        modèle pour correction syntaxique (appel court, sans le CV), au lieu
+        de relancer toute l'analyse.
+        """
+        try:
+            return parse(response, *args)
+        except StructuredOutputError as e:
+            prompt, max_tokens = self._build_repair_prompt(response, e)
+            repaired = self._call_groq(
+                prompt,
+                temperature=0,
+                max_tokens=max_tokens,
+                json_mode=not response.lstrip().startswith('['),
+                validate=lambda r: parse(r, *args)
+            )
+            
+            try:
+                result = parse(repaired, *args)
+            except StructuredOutputError as retry_error:
+                record_repair_retry(False)
+                raise Exception(f"Erreur parsing JSON: {str(retry_error)}\nRéponse: {response}")
+            
+            record_repair_retry(True)
+            return result
     
     def analyze_cv_matching(self, cv_text: str, job_offer: str) -> Dict:
         """
@@ -80,105 +515,265 @@ class CVAnalyzer:
         Returns:
             Dict contenant l'analyse complète
         """
-        prompt = ANALYSIS_PROMPT.format(
-            cv_text=cv_text,
-            job_offer=job_offer
-        )
+        prompt = self._build_analysis_prompt(cv_text, job_offer)
         
-        response = self._call_groq(prompt, temperature=0.3)
+        response = self._call_groq(prompt, temperature=0.3, json_mode=True, validate=self._parse_analysis)
         
-        # Extraire le JSON de la réponse
-        try:
-            # Chercher le JSON dans la réponse
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                analysis = json.loads(json_str)
-                return analysis
-            else:
-                raise ValueError("Aucun JSON trouvé dans la réponse")
-        except json.JSONDecodeError as e:
-            raise Exception(f"Erreur parsing JSON: {str(e)}\nRéponse: {response}")
-    
-    def generate_cover_letter(self, cv_text: str, job_offer: str, 
+        return self._parse_with_repair(response, self._parse_analysis)
+    
+    def stream_cv_matching(self, cv_text: str, job_offer: str) -> Iterator[tuple]:
+        """
+        Analyse de matching en streaming
+        
+        Produit les couples (section, valeur) dès que chaque section du JSON
+        est complète (`score_global` arrive en premier). À la fin du flux,
+        les sections produites forment le même dict qu'`analyze_cv_matching`.
+        """
+        prompt = self._build_analysis_prompt(cv_text, job_offer)
+        
+        parser = JSONObjectStreamParser()
+        chunks = []
+        
+        for delta in self._stream_groq(prompt, temperature=0.3, validate=self._parse_analysis):
+            chunks.append(delta)
+            yield from parser.feed(delta)
+        
+        # Sections que le parser incrémental n'a pas pu isoler ou que la
+        # validation a normalisées
+        analysis = self._parse_with_repair("".join(chunks), self._parse_analysis)
+        for section, value in analysis.items():
+            if parser.result.get(section) != value:
+                yield section, value
+    
+    def generate_cover_letter(self, cv_text: str, job_offer: str,
                              analysis: Dict) -> str:
         """
         Génère une lettre de motivation personnalisée
         """
-        prompt = COVER_LETTER_PROMPT.format(
-            cv_text=cv_text,
-            job_offer=job_offer,
-            score=analysis.get('score_global', 0),
-            strengths=", ".join(analysis.get('points_forts', []))[:200]
-        )
+        prompt = self._build_cover_letter_prompt(cv_text, job_offer, analysis)
         
         letter = self._call_groq(prompt, temperature=0.7, max_tokens=1500)
         return letter
     
+    def stream_cover_letter(self, cv_text: str, job_offer: str,
+                            analysis: Dict) -> Iterator[str]:
+        """
+        Génère la lettre de motivation en streaming (morceaux de texte)
+        """
+        prompt = self._build_cover_letter_prompt(cv_text, job_offer, analysis)
+        
+        yield from self._stream_groq(prompt, temperature=0.7, max_tokens=1500)
+    
     def generate_improvement_suggestions(self, cv_text: str, job_offer: str,
                                         analysis: Dict) -> list:
         """
         Génère des suggestions d'amélioration du CV
         """
-        missing_skills = analysis.get('competences_techniques', {}).get('manquantes', [])
+        prompt = self._build_suggestions_prompt(cv_text, job_offer, analysis)
         
-        prompt = SUGGESTIONS_PROMPT.format(
-            cv_text=cv_text,
-            job_offer=job_offer,
-            missing_skills=", ".join(missing_skills[:5]),
-            score=analysis.get('score_global', 0)
+        response = self._call_groq(
+            prompt, temperature=0.5,
+            validate=lambda r: parse_json_response(r, list)
         )
         
-        response = self._call_groq(prompt, temperature=0.5)
+        return self._parse_suggestions(response, analysis)
+    
+    def generate_full_package(self, cv_text: str, job_offer: str) -> Dict:
+        """
+        Mode complet: analyse, suggestions et lettre en un seul appel
         
-        # Parser la liste Python
-        try:
-            # Extraire la liste de la réponse
-            start_idx = response.find('[')
-            end_idx = response.rfind(']') + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                list_str = response[start_idx:end_idx]
-                suggestions = eval(list_str)  # Sécurisé car on contrôle le prompt
-                return suggestions[:5]
-            else:
-                # Fallback: retourner les suggestions du point_amelioration
-                return analysis.get('points_amelioration', [])[:5]
-        except:
-            return analysis.get('points_amelioration', [])[:5]
+        Le CV et l'offre ne sont envoyés qu'une fois au lieu de trois
+        (analyse, puis lettre, puis suggestions).
+        
+        Returns:
+            Dict avec 'analysis', 'suggestions' et 'cover_letter'
+        """
+        prompt = self._build_full_package_prompt(cv_text, job_offer)
+        
+        response = self._call_groq(
+            prompt, temperature=0.4, max_tokens=4000, json_mode=True,
+            validate=self._parse_full_package
+        )
+        
+        return self._parse_with_repair(response, self._parse_full_package)
     
-    def analyze_multiple_cvs(self, cvs_data: list, job_offer: str) -> Dict:
+    def _score_single_cv(self, cv: Dict, job_offer: str) -> Dict:
         """
-        Mode recruteur: analyse plusieurs CVs
+        Étape "map" du mode recruteur: évalue un seul CV
         
         Args:
-            cvs_data: Liste de dict avec 'name' et 'text'
+            cv: Dict avec 'name' et 'text'
             job_offer: Texte de l'offre
+        
+        Returns:
+            Dict au format d'une entrée de "classement"
         """
-        # Formater les CVs
-        cvs_text = "\n\n=== SEPARATION ===\n\n".join([
-            f"**CANDIDAT: {cv['name']}**\n{cv['text']}"
-            for cv in cvs_data
-        ])
+        prompt = self._build_scoring_prompt(cv, job_offer)
         
-        prompt = RECRUITER_ANALYSIS_PROMPT.format(
-            job_offer=job_offer,
-            cvs_text=cvs_text
+        response = self._call_groq(
+            prompt, temperature=0.3, max_tokens=600, json_mode=True,
+            validate=lambda r: self._parse_scoring(r, cv)
         )
         
-        response = self._call_groq(prompt, temperature=0.3, max_tokens=4000)
+        return self._parse_with_repair(response, self._parse_scoring, cv)
+    
+    def _synthesize_ranking(self, classement: list, job_offer: str) -> str:
+        """
+        Synthèse comparative à partir des évaluations résumées (appel court)
+        """
+        prompt = self._build_synthesis_prompt(classement, job_offer)
         
         try:
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
+            return self._call_groq(prompt, temperature=0.3, max_tokens=400)
+        except Exception:
+            # La synthèse est secondaire: ne pas perdre le classement pour autant
+            return self._fallback_synthesis(classement)
+    
+    def analyze_multiple_cvs(self, cvs_data: list, job_offer: str,
+                             max_workers: int = MAX_PARALLEL_REQUESTS) -> Dict:
+        """
+        Mode recruteur: analyse plusieurs CVs
+        
+        Chaque CV est évalué indépendamment (appels en parallèle), puis les
+        évaluations sont fusionnées et triées localement. Un dernier appel
+        court rédige la synthèse comparative à partir des résumés.
+        
+        Args:
+            cvs_data: Liste de dict avec 'name' et 'text'
+            job_offer: Texte de l'offre
+            max_workers: Nombre maximal d'appels simultanés
+        
+        Returns:
+            Dict {"classement": [...], "synthese": "..."}
+        """
+        if not cvs_data:
+            raise ValueError("Aucun CV à analyser")
+        
+        evaluations = [None] * len(cvs_data)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cvs_data)))) as executor:
+            futures = {
+                executor.submit(self._score_single_cv, cv, job_offer): i
+                for i, cv in enumerate(cvs_data)
+            }
             
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                ranking = json.loads(json_str)
-                return ranking
-            else:
-                raise ValueError("Aucun JSON trouvé")
-        except Exception as e:
-            raise Exception(f"Erreur parsing: {str(e)}")
\ No newline at end of file
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    evaluations[i] = future.result()
+                except Exception as e:
+                    # Un CV en erreur ne doit pas faire échouer tout le lot
+                    evaluations[i] = self._error_evaluation(cvs_data[i], e)
+        
+        classement = self._merge_rankings(evaluations)
+        
+        return {
+            "classement": classement,
+            "synthese": self._synthesize_ranking(classement, job_offer)
+        }
+    
+    def _triage_scores(self, cvs_data: list, job_offer: str,
+                       max_workers: int) -> Optional[list]:
+        """
+        Scores de tri rapide de tous les CVs (appels courts en parallèle)
+        
+        Returns:
+            list: Scores du modèle, ou None si un seul appel a échoué: le
+            score par mots-clés n'est pas sur la même échelle, l'appelant
+            trie alors tout le lot localement plutôt que de mélanger les deux
+        """
+        def triage(cv: Dict) -> Optional[int]:
+            try:
+                prompt = self._build_triage_prompt(cv, job_offer)
+                response = self._call_groq(
+                    prompt, temperature=0, max_tokens=20, json_mode=True,
+                    validate=self._parse_triage
+                )
+                return self._parse_triage(response)
+            except Exception:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cvs_data)))) as executor:
+            scores = list(executor.map(triage, cvs_data))
+        
+        return None if None in scores else scores
+    
+    def analyze_multiple_cvs_cascade(self, cvs_data: list, job_offer: str,
+                                     top_k: int = CASCADE_TOP_K,
+                                     triage_model: Optional[str] = TRIAGE_MODEL,
+                                     max_workers: int = MAX_PARALLEL_REQUESTS) -> Dict:
+        """
+        Mode recruteur en cascade pour les gros volumes
+        
+        Tous les CVs sont d'abord triés par un petit modèle rapide (ou, si
+        triage_model est None, par un score local par mots-clés). Seuls les
+        top_k meilleurs passent l'évaluation détaillée avec le modèle de
+        l'analyseur. Si un appel de tri échoue, tout le lot est trié par
+        mots-clés (jamais un mélange de scores d'échelles différentes).
+        
+        Les CVs écartés sont ajoutés à la suite des résultats détaillés, dans
+        l'ordre du tri rapide, sans être re-triés avec eux: leur score de tri
+        n'est qu'indicatif et pas comparable à un score détaillé.
+        
+        Args:
+            cvs_data: Liste de dict avec 'name' et 'text'
+            job_offer: Texte de l'offre
+            top_k: Nombre de CVs présélectionnés pour l'analyse détaillée
+            triage_model: Modèle de tri (None = tri local sans IA)
+            max_workers: Nombre maximal d'appels simultanés
+        
+        Returns:
+            Dict {"classement": [...], "synthese": "...", "cascade": {rapport}}
+        """
+        if not cvs_data:
+            raise ValueError("Aucun CV à analyser")
+        
+        # 1. Tri rapide
+        start = time.perf_counter()
+        scores = None
+        triage_source = triage_model
+        triage_usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        if triage_model:
+            triage_analyzer = self._for_model(triage_model)
+            scores = triage_analyzer._triage_scores(cvs_data, job_offer, max_workers)
+            triage_usage = triage_analyzer.usage
+        if scores is None:
+            scores = [keyword_score(cv['text'], job_offer) for cv in cvs_data]
+            triage_source = "mots-clés (local)"
+            if triage_model:
+                triage_source += f", repli après échec de {triage_model}"
+        triage_seconds = time.perf_counter() - start
+        
+        order = sorted(range(len(cvs_data)), key=lambda i: -scores[i])
+        shortlist = [cvs_data[i] for i in order[:top_k]]
+        others = [self._triage_evaluation(cvs_data[i], scores[i]) for i in order[top_k:]]
+        
+        # 2. Analyse détaillée des présélectionnés (map-reduce habituel)
+        start = time.perf_counter()
+        detail_analyzer = self._for_model(self.model)
+        ranking = detail_analyzer.analyze_multiple_cvs(shortlist, job_offer, max_workers)
+        detail_seconds = time.perf_counter() - start
+        detail_usage = detail_analyzer.usage
+        
+        for candidate in ranking['classement']:
+            candidate['preselection'] = True
+        ranking['classement'].extend(others)
+        
+        # 3. Rapport: économie estimée = CVs écartés x coût moyen d'une évaluation détaillée
+        detail_tokens = detail_usage['prompt_tokens'] + detail_usage['completion_tokens']
+        per_cv_tokens = detail_tokens / max(1, len(shortlist))
+        
+        ranking['cascade'] = {
+            'candidats': len(cvs_data),
+            'preselectionnes': len(shortlist),
+            'modele_tri': triage_source,
+            'modele_detail': self.model,
+            'duree_tri_s': round(triage_seconds, 2),
+            'duree_detail_s': round(detail_seconds, 2),
+            'tokens_tri': triage_usage['prompt_tokens'] + triage_usage['completion_tokens'],
+            'tokens_detail': detail_tokens,
+            'tokens_economises_estimes': round(per_cv_tokens * len(others)),
+            'appels_detailles_evites': len(others)
+        }
+        
+        return ranking
\ No newline at end of file
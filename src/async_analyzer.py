@@ -0,0 +1,342 @@
+"""
+Analyse IA asynchrone avec Groq (asyncio)
+"""
+import asyncio
+from groq import AsyncGroq
+from typing import AsyncIterator, Dict, Optional
+from src.ai_analyzer import BaseCVAnalyzer
+from src.json_stream import JSONObjectStreamParser
+from src.prompt_templates import SYSTEM_PROMPT
+from src.response_cache import make_cache_key
+from src.rate_limiter import get_scheduler
+from src.structured_output import StructuredOutputError, parse_json_response, record_repair_retry
+from src.text_compactor import estimate_tokens
+from utils.config import MAX_PARALLEL_REQUESTS, REQUEST_TIMEOUT
+
+class AsyncCVAnalyzer(BaseCVAnalyzer):
+    """
+    Analyseur de CV asynchrone
+    
+    Toutes les méthodes publiques sont des coroutines: une seule boucle
+    d'événements peut garder des dizaines d'appels en vol. Le nombre
+    d'appels simultanés est borné par un sémaphore partagé par l'instance,
+    et chaque appel est soumis à un délai maximal. Annuler la tâche
+    appelante annule la requête HTTP en cours.
+    """
+    
+    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile",
+                 max_concurrency: int = MAX_PARALLEL_REQUESTS,
+                 timeout: float = REQUEST_TIMEOUT):
+        """
+        Initialise l'analyseur asynchrone
+        
+        Aucun appel réseau n'est fait ici (un constructeur ne peut pas être
+        attendu): utiliser `test_connection()` pour valider la clé.
+        
+        Args:
+            api_key: Clé API Groq (OBLIGATOIRE)
+            model: Modèle à utiliser
+            max_concurrency: Nombre maximal d'appels simultanés
+            timeout: Délai maximal d'un appel (secondes)
+        """
+        self._validate_api_key(api_key)
+        
+        # Les retries sont gérés par l'ordonnanceur, pas par le client
+        self.client = AsyncGroq(api_key=api_key, max_retries=0)
+        self.model = model
+        self.scheduler = get_scheduler(api_key, model)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Ferme le pool de connexions HTTP"""
+        await self.client.close()
+    
+    async def test_connection(self):
+        """Teste la connexion avec un appel minimal"""
+        try:
+            # Appel direct: ne doit jamais être servi par le cache
+            await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": "test"}],
+                    max_tokens=5,
+                    temperature=0
+                ),
+                timeout=self.timeout
+            )
+        except Exception as e:
+            raise ValueError(f"❌ Clé API invalide ou problème de connexion: {str(e)}")
+    
+    async def _call_groq(self, prompt: str, system_prompt: str = SYSTEM_PROMPT,
+                         temperature: float = 0.3,
+                         max_tokens: int = 4000,
+                         timeout: Optional[float] = None,
+                         json_mode: bool = False,
+                         validate=None) -> str:
+        """
+        Appel générique asynchrone à l'API Groq (même cache que CVAnalyzer;
+        seules les réponses acceptées par `validate` y sont enregistrées)
+        """
+        cache_key = make_cache_key(self.model, system_prompt, prompt, temperature, max_tokens)
+        cached = self._cached_response(cache_key, validate)
+        if cached is not None:
+            return cached
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        
+        options = {}
+        if self._uses_json_mode(json_mode):
+            options["response_format"] = {"type": "json_object"}
+        
+        async with self._semaphore:
+            try:
+                # Attente de quota et retries dans l'ordonnanceur partagé
+                response = await self.scheduler.execute_async(
+                    lambda: asyncio.wait_for(
+                        self.client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            **options
+                        ),
+                        timeout=timeout or self.timeout
+                    ),
+                    tokens=estimate_tokens(system_prompt + prompt) + max_tokens
+                )
+            except asyncio.TimeoutError:
+                raise Exception(f"Erreur API Groq: délai de {timeout or self.timeout:.0f}s dépassé")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                raise Exception(f"Erreur API Groq: {str(e)}")
+        
+        content = response.choices[0].message.content.strip()
+        
+        self._cache_response(cache_key, content, validate)
+        return content
+    
+    async def _stream_groq(self, prompt: str, system_prompt: str = SYSTEM_PROMPT,
+                           temperature: float = 0.3,
+                           max_tokens: int = 4000,
+                           validate=None) -> AsyncIterator[str]:
+        """
+        Appel asynchrone en streaming: produit le texte au fil de l'eau
+        """
+        cache_key = make_cache_key(self.model, system_prompt, prompt, temperature, max_tokens)
+        cached = self._cached_response(cache_key, validate)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        async with self._semaphore:
+            try:
+                stream = await self.scheduler.execute_async(
+                    lambda: asyncio.wait_for(
+                        self.client.chat.completions.create(
+                            model=self.model,
+                            messages=[
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": prompt}
+                            ],
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            stream=True
+                        ),
+                        timeout=self.timeout
+                    ),
+                    tokens=estimate_tokens(system_prompt + prompt) + max_tokens
+                )
+                
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        chunks.append(delta)
+                        yield delta
+            except asyncio.TimeoutError:
+                raise Exception(f"Erreur API Groq: délai de {self.timeout:.0f}s dépassé")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                raise Exception(f"Erreur API Groq: {str(e)}")
+        
+        self._cache_response(cache_key, "".join(chunks).strip(), validate)
+    
+    async def _parse_with_repair(self, response: str, parse, *args):
+        """
+        Interprète une réponse structurée, avec un appel de réparation en secours
+        """
+        try:
+            return parse(response, *args)
+        except StructuredOutputError as e:
+            prompt, max_tokens = self._build_repair_prompt(response, e)
+            repaired = await self._call_groq(
+                prompt,
+                temperature=0,
+                max_tokens=max_tokens,
+                json_mode=not response.lstrip().startswith('['),
+                validate=lambda r: parse(r, *args)
+            )
+            
+            try:
+                result = parse(repaired, *args)
+            except StructuredOutputError as retry_error:
+                record_repair_retry(False)
+                raise Exception(f"Erreur parsing JSON: {str(retry_error)}\nRéponse: {response}")
+            
+            record_repair_retry(True)
+            return result
+    
+    async def analyze_cv_matching(self, cv_text: str, job_offer: str) -> Dict:
+        """
+        Analyse principale: matching CV vs offre d'emploi
+        """
+        prompt = self._build_analysis_prompt(cv_text, job_offer)
+        
+        response = await self._call_groq(prompt, temperature=0.3, json_mode=True, validate=self._parse_analysis)
+        
+        return await self._parse_with_repair(response, self._parse_analysis)
+    
+    async def stream_cv_matching(self, cv_text: str, job_offer: str) -> AsyncIterator[tuple]:
+        """
+        Analyse de matching en streaming: (section, valeur) dès que complète
+        """
+        prompt = self._build_analysis_prompt(cv_text, job_offer)
+        
+        parser = JSONObjectStreamParser()
+        chunks = []
+        
+        async for delta in self._stream_groq(prompt, temperature=0.3, validate=self._parse_analysis):
+            chunks.append(delta)
+            for item in parser.feed(delta):
+                yield item
+        
+        analysis = await self._parse_with_repair("".join(chunks), self._parse_analysis)
+        for section, value in analysis.items():
+            if parser.result.get(section) != value:
+                yield section, value
+    
+    async def stream_cover_letter(self, cv_text: str, job_offer: str,
+                                  analysis: Dict) -> AsyncIterator[str]:
+        """
+        Génère la lettre de motivation en streaming
+        """
+        prompt = self._build_cover_letter_prompt(cv_text, job_offer, analysis)
+        
+        async for delta in self._stream_groq(prompt, temperature=0.7, max_tokens=1500):
+            yield delta
+    
+    async def generate_cover_letter(self, cv_text: str, job_offer: str,
+                                    analysis: Dict) -> str:
+        """
+        Génère une lettre de motivation personnalisée
+        """
+        prompt = self._build_cover_letter_prompt(cv_text, job_offer, analysis)
+        
+        return await self._call_groq(prompt, temperature=0.7, max_tokens=1500)
+    
+    async def generate_improvement_suggestions(self, cv_text: str, job_offer: str,
+                                               analysis: Dict) -> list:
+        """
+        Génère des suggestions d'amélioration du CV
+        """
+        prompt = self._build_suggestions_prompt(cv_text, job_offer, analysis)
+        
+        response = await self._call_groq(
+            prompt, temperature=0.5,
+            validate=lambda r: parse_json_response(r, list)
+        )
+        
+        return self._parse_suggestions(response, analysis)
+    
+    async def generate_followups(self, cv_text: str, job_offer: str,
+                                 analysis: Dict) -> tuple[str, list]:
+        """
+        Lettre de motivation et suggestions en parallèle
+        
+        Returns:
+            tuple: (lettre, suggestions)
+        """
+        return await asyncio.gather(
+            self.generate_cover_letter(cv_text, job_offer, analysis),
+            self.generate_improvement_suggestions(cv_text, job_offer, analysis)
+        )
+    
+    async def generate_full_package(self, cv_text: str, job_offer: str) -> Dict:
+        """
+        Mode complet: analyse, suggestions et lettre en un seul appel
+        """
+        prompt = self._build_full_package_prompt(cv_text, job_offer)
+        
+        response = await self._call_groq(
+            prompt, temperature=0.4, max_tokens=4000, json_mode=True,
+            validate=self._parse_full_package
+        )
+        
+        return await self._parse_with_repair(response, self._parse_full_package)
+    
+    async def _score_single_cv(self, cv: Dict, job_offer: str) -> Dict:
+        """
+        Étape "map" du mode recruteur: évalue un seul CV
+        """
+        prompt = self._build_scoring_prompt(cv, job_offer)
+        
+        try:
+            response = await self._call_groq(
+                prompt, temperature=0.3, max_tokens=600, json_mode=True,
+                validate=lambda r: self._parse_scoring(r, cv)
+            )
+            return await self._parse_with_repair(response, self._parse_scoring, cv)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Un CV en erreur ne doit pas faire échouer tout le lot
+            return self._error_evaluation(cv, e)
+    
+    async def analyze_multiple_cvs(self, cvs_data: list, job_offer: str) -> Dict:
+        """
+        Mode recruteur: évalue chaque CV en parallèle puis fusionne le classement
+        
+        Args:
+            cvs_data: Liste de dict avec 'name' et 'text'
+            job_offer: Texte de l'offre
+        
+        Returns:
+            Dict {"classement": [...], "synthese": "..."}
+        """
+        if not cvs_data:
+            raise ValueError("Aucun CV à analyser")
+        
+        # gather() annule les évaluations restantes si l'appelant est annulé
+        evaluations = await asyncio.gather(*[
+            self._score_single_cv(cv, job_offer) for cv in cvs_data
+        ])
+        
+        classement = self._merge_rankings(list(evaluations))
+        
+        try:
+            synthese = await self._call_groq(
+                self._build_synthesis_prompt(classement, job_offer),
+                temperature=0.3,
+                max_tokens=400
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            synthese = self._fallback_synthesis(classement)
+        
+        return {
+            "classement": classement,
+            "synthese": synthese
+        }
\ No newline at end of file
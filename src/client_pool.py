@@ -0,0 +1,74 @@
+"""
+Pool d'analyseurs partagé par tout le processus Streamlit
+"""
+import hashlib
+import threading
+import time
+from groq import Groq
+from src.ai_analyzer import CVAnalyzer
+from utils.config import DEFAULT_MODEL, API_KEY_VALIDATION_TTL
+
+# Un client Groq (et donc un pool de connexions HTTP) par clé API,
+# un analyseur par couple (clé, modèle). Les variables de module survivent
+# aux reruns Streamlit et sont partagées entre les sessions.
+_clients = {}
+_analyzers = {}
+_validated_at = {}
+_lock = threading.Lock()
+
+def _hash_key(api_key: str) -> str:
+    """Empreinte de la clé API (la clé en clair n'est jamais utilisée comme index)"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+def get_analyzer(api_key: str, model: str = DEFAULT_MODEL) -> CVAnalyzer:
+    """
+    Retourne un analyseur prêt à l'emploi pour cette clé et ce modèle
+    
+    La clé n'est validée par un appel réseau qu'à la première utilisation,
+    puis à nouveau après API_KEY_VALIDATION_TTL secondes.
+    
+    Raises:
+        ValueError: Clé absente, mal formée ou refusée par Groq
+    """
+    CVAnalyzer._validate_api_key(api_key)
+    
+    key_hash = _hash_key(api_key)
+    pool_key = (key_hash, model)
+    
+    with _lock:
+        if key_hash not in _clients:
+            _clients[key_hash] = Groq(api_key=api_key, max_retries=0)
+        
+        analyzer = _analyzers.get(pool_key)
+        if analyzer is None:
+            analyzer = CVAnalyzer(
+                api_key,
+                model=model,
+                client=_clients[key_hash],
+                test_connection=False
+            )
+            _analyzers[pool_key] = analyzer
+        
+        validated_at = _validated_at.get(pool_key)
+    
+    if validated_at is None or time.time() - validated_at > API_KEY_VALIDATION_TTL:
+        try:
+            analyzer._test_connection()
+        except Exception as e:
+            invalidate(api_key)
+            raise ValueError(f"❌ Erreur de connexion à Groq: {str(e)}")
+        
+        with _lock:
+            _validated_at[pool_key] = time.time()
+    
+    return analyzer
+
+def invalidate(api_key: str):
+    """Oublie les analyseurs et la validation associés à une clé"""
+    key_hash = _hash_key(api_key)
+    
+    with _lock:
+        _clients.pop(key_hash, None)
+        for pool_key in [k for k in _analyzers if k[0] == key_hash]:
+            _analyzers.pop(pool_key, None)
+            _validated_at.pop(pool_key, None)
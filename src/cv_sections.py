@@ -0,0 +1,128 @@
+"""
+Découpage local d'un CV en sections (compétences, expérience, formation...)
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+def _heading(pattern: str) -> re.Pattern:
+    """Motif d'un titre: la ligne entière, jamais une sous-chaîne"""
+    return re.compile(rf"^(?:{pattern})$", re.I)
+
+# Sections reconnues (FR/EN) et motif de leur titre (qualificatifs usuels inclus)
+SECTION_HEADINGS = [
+    ("profil", _heading(
+        r"(?:mon )?profils?(?: professionnel)?|r[ée]sum[ée]|(?:professional )?summary|profile"
+        r"|about me|[àa] propos(?: de moi)?|objecti(?:f|ve)s?(?: professionnels?)?"
+    )),
+    ("competences", _heading(
+        r"comp[ée]tences?(?: techniques| cl[ée]s| informatiques| professionnelles)?"
+        r"|(?:technical |key |core )?skills|savoir-faire"
+    )),
+    ("experience", _heading(
+        r"exp[ée]riences?(?: professionnelles?)?|(?:professional |work )?experiences?"
+        r"|parcours(?: professionnel)?|employment(?: history)?|work history"
+    )),
+    ("formation", _heading(
+        r"formations?(?: acad[ée]miques?| initiales?)?|education|dipl[ôo]mes?|[ée]tudes"
+        r"|cursus(?: universitaire| scolaire)?|academic background"
+    )),
+    ("projets", _heading(
+        r"projets?(?: personnels| professionnels| r[ée]alis[ée]s)?|(?:personal |side )?projects?"
+        r"|r[ée]alisations"
+    )),
+    ("certifications", _heading(r"certifications?|certificats?")),
+    ("langues", _heading(r"langues?(?: parl[ée]es| [ée]trang[èe]res)?|languages?")),
+    ("centres_interet", _heading(
+        r"centres? d['’]int[ée]r[êe]ts?|loisirs|hobbies|interests|activit[ée]s extra-?professionnelles"
+    )),
+    ("references", _heading(r"r[ée]f[ée]rences?")),
+]
+# Titres combinés: "Formation et diplômes", "Skills & Languages"
+HEADING_JOINER = re.compile(r"\s+(?:et|and|&|/)\s+|\s*[&/]\s*", re.I)
+# Texte précédant le premier titre (nom, coordonnées, accroche)
+HEADER_SECTION = "entete"
+
+HEADING_MAX_CHARS = 40
+HEADING_MAX_WORDS = 5
+
+def detect_heading(line: str) -> Optional[str]:
+    """
+    Nom de la section si la ligne est un titre, sinon None
+    
+    Un titre est une ligne courte (quelques mots, sans ponctuation de fin
+    de phrase) formée uniquement d'un intitulé de section: "Chef de
+    projet" ou "Développeur Full Stack" ne sont pas des titres. Pour un
+    titre combiné ("Expériences et compétences"), chaque partie doit être
+    un intitulé et la première l'emporte.
+    """
+    candidate = line.strip().strip("•-–—:#*| ").strip()
+    if not candidate or len(candidate) > HEADING_MAX_CHARS:
+        return None
+    if len(candidate.split()) > HEADING_MAX_WORDS or candidate[-1] in ".,;":
+        return None
+    
+    names = [_match_heading(part) for part in HEADING_JOINER.split(candidate)]
+    return names[0] if all(names) else None
+
+def _match_heading(part: str) -> Optional[str]:
+    part = " ".join(part.split())
+    for name, pattern in SECTION_HEADINGS:
+        if pattern.match(part):
+            return name
+    return None
+
+@lru_cache(maxsize=128)
+def _segment(text: str) -> tuple:
+    sections = []
+    name, heading, start = HEADER_SECTION, None, 0
+    offset = 0
+    
+    for line in text.splitlines(keepends=True):
+        section = detect_heading(line)
+        if section:
+            sections.append((name, heading, start, offset))
+            name, heading, start = section, line.strip(), offset
+        offset += len(line)
+    sections.append((name, heading, start, offset))
+    
+    return tuple(
+        (name, heading, start, end) for name, heading, start, end in sections
+        if text[start:end].strip()
+    )
+
+def segment_cv(text: str) -> list:
+    """
+    Découpe le texte d'un CV en sections, dans l'ordre du document
+    
+    Déterministe et sans appel IA: le résultat est mis en cache par texte.
+    
+    Returns:
+        list: Dicts {'name', 'heading', 'text', 'start', 'end'}; `start` et
+        `end` sont les positions (caractères) de la section dans `text`,
+        titre compris
+    """
+    return [
+        {'name': name, 'heading': heading, 'text': text[start:end].strip(), 'start': start, 'end': end}
+        for name, heading, start, end in _segment(text)
+    ]
+
+def get_sections(text: str) -> dict:
+    """Texte de chaque section, les sections répétées étant regroupées"""
+    grouped = {}
+    for section in segment_cv(text):
+        grouped.setdefault(section['name'], []).append(section['text'])
+    return {name: "\n\n".join(parts) for name, parts in grouped.items()}
+
+def select_sections(text: str, names: set) -> str:
+    """
+    Ne garde que les sections demandées (ordre du document conservé)
+    
+    Sans titre reconnu, le CV est renvoyé tel quel plutôt que vidé.
+    """
+    sections = segment_cv(text)
+    if all(section['name'] == HEADER_SECTION for section in sections):
+        return text
+    
+    kept = [section['text'] for section in sections if section['name'] in names]
+    return "\n\n".join(kept) if kept else text
\ No newline at end of file
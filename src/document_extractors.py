@@ -0,0 +1,320 @@
+"""
+Registre des extracteurs de texte par format de document (PDF, DOCX, TXT)
+"""
+import hashlib
+import zipfile
+from pathlib import Path
+from typing import Iterator, Optional
+import docx
+from utils.buffers import Buffer, BufferStream, read_buffer, share_buffer
+from src.extraction_cache import EXTRACTION_CACHE, make_extraction_key
+from src.pdf_limits import DocumentLimitError, check_size
+from src.parsed_pdf import ParsedPDF
+from src.pdf_processor import PDFProcessor
+from src.pdf_workers import run_in_workers
+from utils.config import (
+    PDF_WORKERS,
+    PDF_EXTRACTION_TIMEOUT,
+    PDF_EXTRACTION_METHOD,
+    MAX_PDF_PAGES,
+    MAX_EXTRACTED_CHARS,
+    DOCX_MAX_UNCOMPRESSED_MB
+)
+
+# Format -> {'sniff', 'weak_sniff', 'extract', 'mime_types', 'extensions'}, dans l'ordre de détection
+EXTRACTORS = {}
+
+def register_extractor(name: str, sniff, mime_types: tuple = (), extensions: tuple = (),
+                       weak_sniff: bool = False):
+    """
+    Enregistre un extracteur: `extract(data, method) -> str`
+    
+    Args:
+        name: Nom du format ('pdf', 'docx'...)
+        sniff: Fonction `sniff(data) -> bool` qui reconnaît le format aux octets
+        mime_types: Types MIME acceptés (utilisés si les octets sont ambigus)
+        extensions: Extensions de fichier associées
+        weak_sniff: Le format n'a pas de signature (texte brut): ses octets
+            ne sont examinés qu'après le type MIME et l'extension déclarés
+    """
+    def decorator(extract):
+        EXTRACTORS[name] = {
+            'sniff': sniff,
+            'weak_sniff': weak_sniff,
+            'extract': extract,
+            'mime_types': set(mime_types),
+            'extensions': set(extensions)
+        }
+        return extract
+    return decorator
+
+def _is_pdf(data: Buffer) -> bool:
+    # En-tête en début de fichier (seuls un BOM ou des blancs sont tolérés
+    # avant): un texte qui cite "%PDF-" n'est pas pris pour un PDF
+    head = bytes(data[:64])
+    if head.startswith(b"\xef\xbb\xbf"):
+        head = head[3:]
+    return head.lstrip().startswith(b"%PDF-")
+
+def _is_docx(data: Buffer) -> bool:
+    if bytes(data[:4]) != b"PK\x03\x04":
+        return False
+    try:
+        with zipfile.ZipFile(BufferStream(data)) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+def _is_text(data: Buffer) -> bool:
+    head = bytes(data[:4096])
+    if b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+        return True
+    except UnicodeDecodeError as e:
+        # Caractère multi-octets coupé en fin d'échantillon: pas une erreur
+        return e.start >= len(head) - 3
+
+@register_extractor("pdf", _is_pdf, ("application/pdf",), ("pdf",))
+def extract_pdf(data: Buffer, method: str) -> str:
+    # Cache, limites de pages et méthodes d'extraction: voir PDFProcessor
+    return PDFProcessor.extract_text(data, method)
+
+@register_extractor(
+    "docx", _is_docx,
+    ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",),
+    ("docx",)
+)
+def extract_docx(data: Buffer, method: str) -> str:
+    with zipfile.ZipFile(BufferStream(data)) as archive:
+        uncompressed = sum(info.file_size for info in archive.infolist())
+    if uncompressed > DOCX_MAX_UNCOMPRESSED_MB * 1024 * 1024:
+        raise DocumentLimitError(
+            f"Document trop volumineux une fois décompressé (max {DOCX_MAX_UNCOMPRESSED_MB} MB)"
+        )
+    
+    document = docx.Document(BufferStream(data))
+    lines = [paragraph.text for paragraph in document.paragraphs]
+    # Beaucoup de CVs Word sont mis en page avec des tableaux
+    for table in document.tables:
+        for row in table.rows:
+            lines.append(" | ".join(cell.text.strip() for cell in row.cells if cell.text.strip()))
+    
+    return "\n".join(line for line in lines if line.strip())
+
+@register_extractor("txt", _is_text, ("text/plain",), ("txt",), weak_sniff=True)
+def extract_txt(data: Buffer, method: str) -> str:
+    for encoding in ("utf-8-sig", "cp1252"):
+        try:
+            return str(data, encoding)
+        except UnicodeDecodeError:
+            continue
+    return str(data, "latin-1")
+
+def detect_format(data: Buffer, mime_type: Optional[str] = None,
+                  filename: Optional[str] = None) -> str:
+    """
+    Format du document, reconnu d'abord aux signatures (magic bytes), puis
+    au type MIME ou à l'extension déclarés, enfin aux octets des formats
+    sans signature (texte brut)
+    
+    Raises:
+        Exception: Format non pris en charge
+    """
+    for name, extractor in EXTRACTORS.items():
+        if not extractor['weak_sniff'] and extractor['sniff'](data):
+            return name
+    
+    extension = Path(filename).suffix.lower().lstrip(".") if filename else None
+    for name, extractor in EXTRACTORS.items():
+        if mime_type in extractor['mime_types'] or extension in extractor['extensions']:
+            return name
+    
+    for name, extractor in EXTRACTORS.items():
+        if extractor['weak_sniff'] and extractor['sniff'](data):
+            return name
+    
+    raise Exception(f"Format de document non pris en charge ({filename or mime_type or 'inconnu'})")
+
+def _cache_key(data: Buffer, document_format: str, method: str) -> Optional[str]:
+    content_hash = hashlib.sha256(data).hexdigest()
+    if document_format == "pdf":
+        # Même clé que PDFProcessor.extract_text
+        return make_extraction_key(content_hash, method, MAX_PDF_PAGES, MAX_EXTRACTED_CHARS)
+    return make_extraction_key(content_hash, document_format, MAX_EXTRACTED_CHARS)
+
+def extract_document(data: Buffer, method: str = PDF_EXTRACTION_METHOD,
+                     mime_type: Optional[str] = None, filename: Optional[str] = None,
+                     document_format: Optional[str] = None) -> str:
+    """
+    Extrait le texte d'un document, quel que soit son format
+    
+    Mêmes garde-fous (taille) et même cache que les PDFs.
+    
+    Args:
+        data: Contenu du fichier
+        method: Méthode d'extraction des PDFs (ignorée pour les autres formats)
+        mime_type: Type MIME déclaré (facultatif)
+        filename: Nom du fichier (facultatif)
+        document_format: Format déjà détecté (évite une nouvelle détection)
+    """
+    check_size(len(data))
+    document_format = document_format or detect_format(data, mime_type, filename)
+    if document_format == "pdf":
+        return extract_pdf(data, method)
+    
+    cache_key = _cache_key(data, document_format, method)
+    if cache_key:
+        cached = EXTRACTION_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    text = EXTRACTORS[document_format]['extract'](data, method)[:MAX_EXTRACTED_CHARS].strip()
+    if cache_key and text:
+        EXTRACTION_CACHE.set(cache_key, text)
+    return text
+
+def inspect_document(data: Buffer, method: str = PDF_EXTRACTION_METHOD,
+                     document_format: Optional[str] = None) -> dict:
+    """
+    Validation, informations et texte d'un document en une seule passe
+    
+    Le document est parsé une fois pour les trois. À n'appeler que dans un
+    processus bridé (voir inspect_document_isolated): c'est ici qu'un
+    fichier piégé est ouvert par PyPDF2 / pdfplumber.
+    
+    Returns:
+        dict: {'text', 'error', 'info'}; `error` renseigné si le document est invalide
+    """
+    check_size(len(data))
+    document_format = document_format or detect_format(data)
+    info = {"size_bytes": len(data)}
+    
+    if document_format != "pdf":
+        return {'text': extract_document(data, method, document_format=document_format), 'error': None, 'info': info}
+    
+    with ParsedPDF(data) as pdf:
+        is_valid, error = PDFProcessor.validate_pdf(pdf)
+        if not is_valid:
+            return {'text': None, 'error': error, 'info': info}
+        info.update(PDFProcessor.get_pdf_info(pdf))
+        text = PDFProcessor.extract_text(pdf, method)
+    return {'text': text, 'error': None, 'info': info}
+
+def extract_documents(documents, method: str = PDF_EXTRACTION_METHOD,
+                      max_workers: int = PDF_WORKERS,
+                      timeout: float = PDF_EXTRACTION_TIMEOUT,
+                      with_info: bool = False) -> Iterator[dict]:
+    """
+    Extrait le texte d'un lot de documents (PDF, DOCX, TXT) en parallèle
+    
+    Les fichiers trop gros ou d'un format inconnu sont refusés d'emblée, les
+    fichiers en cache sont servis immédiatement, les autres sont extraits
+    dans des processus bridés et interruptibles (voir pdf_workers).
+    
+    Args:
+        with_info: Valide le document et renvoie ses informations (pages,
+            taille...) avec le texte; tout passe alors par un processus
+            bridé, même si le texte est en cache
+    
+    Yields:
+        dict: {'index', 'name', 'format', 'text', 'error', 'info'} dans l'ordre de fin d'extraction
+    """
+    entries = []
+    for index, document in enumerate(documents):
+        data, name, mime_type, path = read_buffer(document)
+        entries.append({
+            'data': data,
+            'name': name or f"document_{index + 1}",
+            'mime': mime_type,
+            'path': path
+        })
+    
+    def result(index, text=None, error=None, info=None):
+        return {
+            'index': index,
+            'name': entries[index]['name'],
+            'format': entries[index].get('format'),
+            'text': text,
+            'error': error,
+            'info': info
+        }
+    
+    to_extract = []
+    for index, entry in enumerate(entries):
+        try:
+            check_size(len(entry['data']))
+            entry['format'] = detect_format(entry['data'], entry['mime'], entry['name'])
+        except Exception as e:
+            yield result(index, error=str(e))
+            continue
+        
+        cache_key = _cache_key(entry['data'], entry['format'], method)
+        cached = EXTRACTION_CACHE.get(cache_key) if cache_key and not with_info else None
+        if cached is not None:
+            yield result(index, text=cached)
+        else:
+            to_extract.append(index)
+    
+    # Le contenu est transmis par référence (fichier mappé ou mémoire
+    # partagée), jamais sérialisé; le segment n'existe que le temps du job
+    segments = {}
+    
+    def jobs():
+        for job_index, index in enumerate(to_extract):
+            entry = entries[index]
+            if entry['path']:
+                handle = ("file", entry['path'])
+            else:
+                segments[job_index] = share_buffer(entry['data'])
+                handle = ("shm", segments[job_index].name, len(entry['data']))
+            yield handle, method, entry['format'], with_info
+    
+    try:
+        for job_index, success, payload in run_in_workers(jobs(), max_workers=max_workers, timeout=timeout):
+            _release_segment(segments.pop(job_index, None))
+            index = to_extract[job_index]
+            if not success:
+                yield result(index, error=payload)
+            elif with_info:
+                yield result(index, **payload)
+            else:
+                yield result(index, text=payload)
+    finally:
+        for segment in segments.values():
+            _release_segment(segment)
+
+def _release_segment(segment):
+    if segment is not None:
+        segment.close()
+        segment.unlink()
+
+def extract_document_isolated(document, method: str = PDF_EXTRACTION_METHOD,
+                              timeout: float = PDF_EXTRACTION_TIMEOUT) -> str:
+    """
+    Extrait le texte d'un seul document dans un processus bridé et interruptible
+    
+    Raises:
+        Exception: Format non pris en charge, limite dépassée ou fichier illisible
+    """
+    results = extract_documents([document], method, max_workers=1, timeout=timeout)
+    result = next(results)
+    results.close()
+    if result['error']:
+        raise Exception(result['error'])
+    return result['text']
+
+def inspect_document_isolated(document, method: str = PDF_EXTRACTION_METHOD,
+                              timeout: float = PDF_EXTRACTION_TIMEOUT) -> dict:
+    """
+    Valide un document, lit ses informations et extrait son texte dans un
+    processus bridé et interruptible: le serveur ne parse jamais l'upload
+    
+    Returns:
+        dict: {'name', 'format', 'text', 'error', 'info'} (erreurs renvoyées, pas levées)
+    """
+    results = extract_documents([document], method, max_workers=1, timeout=timeout, with_info=True)
+    result = next(results)
+    results.close()
+    return result
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Cache persistant du texte extrait des PDFs
+"""
+from typing import Optional
+from utils.disk_cache import DiskCache
+from utils.config import (
+    CACHE_DIR,
+    EXTRACTION_CACHE_ENABLED,
+    EXTRACTION_CACHE_MAX_MB
+)
+
+# À incrémenter dès que le texte produit par l'extraction change
+# (nouvelle méthode, nettoyage, limites): les anciennes entrées sont ignorées
+EXTRACTOR_VERSION = "3"
+
+# Pas d'expiration: un même fichier donne toujours le même texte.
+# Seule la taille totale est bornée (éviction LRU).
+EXTRACTION_CACHE = DiskCache(
+    CACHE_DIR / "extraction",
+    max_bytes=EXTRACTION_CACHE_MAX_MB * 1024 * 1024
+)
+
+def make_extraction_key(content_hash: str, method: str, *options) -> Optional[str]:
+    """
+    Clé de cache d'une extraction, ou None si le cache est désactivé
+    
+    Args:
+        content_hash: SHA-256 des octets du PDF
+        method: Méthode d'extraction demandée
+        options: Paramètres qui changent le texte produit (limites...)
+    """
+    if not EXTRACTION_CACHE_ENABLED:
+        return None
+    return DiskCache.make_key("pdf", content_hash, method, EXTRACTOR_VERSION, *options)
+
+def get_extraction_cache_stats() -> dict:
+    """Compteurs hits/misses du cache d'extraction"""
+    return EXTRACTION_CACHE.stats()
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Qualité du texte extrait d'une page PDF (choix de l'extracteur)
+"""
+import re
+import threading
+import unicodedata
+
+# Glyphes sans table Unicode: PyPDF2/pdfplumber produisent "(cid:42)"
+CID_RE = re.compile(r"\(cid:\d+\)")
+# En dessous, une page est considérée vide (ou quasi vide)
+MIN_PAGE_CHARS = 20
+# Au-delà, un "mot" est le signe d'espaces perdus à l'extraction
+MAX_WORD_LENGTH = 25
+
+_stats_lock = threading.Lock()
+ADAPTIVE_STATS = {"pages": 0, "fast_path": 0, "fallback": 0}
+
+def page_quality(text: str) -> float:
+    """
+    Score de qualité (0-1) du texte d'une page
+    
+    Pénalise les pages vides, les glyphes illisibles (cid, caractère de
+    remplacement, zone privée Unicode) et les mots collés (espaces perdus).
+    """
+    stripped = CID_RE.sub("�", text or "").strip()
+    if len(stripped) < MIN_PAGE_CHARS:
+        return 0.0
+    
+    visible = [char for char in stripped if not char.isspace()]
+    garbled = sum(
+        1 for char in visible
+        if char == "�" or unicodedata.category(char) in ("Co", "Cc", "Cs")
+    )
+    garbled_ratio = garbled / len(visible)
+    
+    long_words = sum(len(word) for word in stripped.split() if len(word) > MAX_WORD_LENGTH)
+    missing_spaces_ratio = long_words / len(visible)
+    
+    return max(0.0, 1.0 - 4 * garbled_ratio - missing_spaces_ratio)
+
+def record_page(fallback: bool):
+    """Comptabilise le chemin suivi pour une page en mode adaptatif"""
+    with _stats_lock:
+        ADAPTIVE_STATS["pages"] += 1
+        ADAPTIVE_STATS["fallback" if fallback else "fast_path"] += 1
+
+def get_adaptive_stats() -> dict:
+    """Part des pages extraites par le chemin rapide depuis le démarrage"""
+    with _stats_lock:
+        stats = dict(ADAPTIVE_STATS)
+    stats["fast_path_rate"] = stats["fast_path"] / stats["pages"] if stats["pages"] else 0.0
+    return stats
\ No newline at end of file
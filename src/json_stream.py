@@ -0,0 +1,86 @@
+"""
+Parsing incrémental d'un objet JSON reçu en flux
+"""
+import json
+
+class JSONObjectStreamParser:
+    """
+    Découpe un objet JSON reçu morceau par morceau en membres de premier niveau
+    
+    Chaque appel à `feed()` retourne les couples (clé, valeur) qui viennent
+    d'être complétés, ce qui permet d'afficher `score_global` ou une section
+    dès qu'elle est reçue, sans attendre la fin de la réponse. Le texte
+    éventuel avant la première accolade (préambule du modèle) est ignoré.
+    """
+    
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.result = {}
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member = []
+    
+    def feed(self, chunk: str) -> list:
+        """
+        Ajoute un morceau de texte
+        
+        Returns:
+            list: Couples (clé, valeur) complétés par ce morceau
+        """
+        completed = []
+        
+        for char in chunk:
+            if self.finished:
+                break
+            
+            if not self.started:
+                if char == '{':
+                    self.started = True
+                    self._depth = 1
+                continue
+            
+            if self._in_string:
+                self._member.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._complete_member())
+                    self.finished = True
+                    continue
+            elif char == ',' and self._depth == 1:
+                completed.extend(self._complete_member())
+                continue
+            
+            self._member.append(char)
+        
+        return completed
+    
+    def _complete_member(self) -> list:
+        """Parse le membre `"clé": valeur` accumulé"""
+        text = "".join(self._member).strip()
+        self._member = []
+        
+        if not text:
+            return []
+        
+        try:
+            items = list(json.loads("{" + text + "}").items())
+        except json.JSONDecodeError:
+            return []
+        
+        self.result.update(items)
+        return items
\ No newline at end of file
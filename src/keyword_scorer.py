@@ -0,0 +1,44 @@
+"""
+Score local (sans IA) de correspondance CV / offre par mots-clés
+"""
+import re
+from collections import Counter
+
+# Mots vides FR/EN fréquents dans les offres d'emploi
+STOPWORDS = {
+    "les", "des", "une", "pour", "avec", "dans", "sur", "par", "vous", "nous",
+    "est", "sont", "aux", "que", "qui", "son", "ses", "leur", "leurs", "cette",
+    "ces", "plus", "pas", "tout", "tous", "toute", "toutes", "ainsi", "être",
+    "avoir", "fait", "faire", "comme", "mais", "entre", "chez", "votre", "vos",
+    "notre", "nos", "poste", "profil", "mission", "missions", "entreprise",
+    "équipe", "candidat", "recherchons", "rejoindre", "ans", "expérience",
+    "the", "and", "for", "with", "you", "our", "are", "will", "your", "from",
+    "this", "that", "have", "has", "team", "role", "job", "work", "years",
+}
+
+TERM_RE = re.compile(r"[a-zà-ÿ0-9][a-zà-ÿ0-9+#.\-]*[a-zà-ÿ0-9+#]|[a-zà-ÿ]", re.I)
+
+def extract_keywords(text: str, limit: int = 40) -> Counter:
+    """Termes significatifs du texte, pondérés par leur fréquence"""
+    terms = [
+        term.lower() for term in TERM_RE.findall(text)
+        if len(term) >= 3 or term.lower() in {"c", "r", "go"}
+    ]
+    counts = Counter(term for term in terms if term not in STOPWORDS)
+    return Counter(dict(counts.most_common(limit)))
+
+def keyword_score(cv_text: str, job_offer: str) -> int:
+    """
+    Part pondérée des mots-clés de l'offre présents dans le CV (0-100)
+    
+    Grossier mais instantané: sert au tri préalable des candidatures,
+    jamais au classement final.
+    """
+    keywords = extract_keywords(job_offer)
+    if not keywords:
+        return 0
+    
+    cv_terms = {term.lower() for term in TERM_RE.findall(cv_text)}
+    matched = sum(weight for term, weight in keywords.items() if term in cv_terms)
+    
+    return round(100 * matched / sum(keywords.values()))
\ No newline at end of file
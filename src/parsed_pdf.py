@@ -0,0 +1,209 @@
+"""
+Document PDF ouvert une seule fois et partagé entre validation, infos et extraction
+"""
+import hashlib
+import PyPDF2
+import pdfplumber
+from typing import Iterator, Optional
+from src.extraction_quality import page_quality, record_page
+from src.pdf_layout import extract_columns_text
+from src.pdf_limits import page_cpu_limit
+from utils.buffers import Buffer, BufferStream, read_buffer
+from utils.config import PDF_PAGE_QUALITY_THRESHOLD
+
+# Méthodes qui lisent le document avec pdfplumber (les autres avec PyPDF2)
+PLUMBER_METHODS = ("pdfplumber", "columns")
+# Séparateur des pages dans le texte extrait (repère des en-têtes / pieds de page)
+PAGE_SEPARATOR = "\f"
+
+class ParsedPDF:
+    """
+    PDF chargé une fois en mémoire, analysé à la demande
+    
+    Les octets du fichier sont lus une seule fois; le lecteur PyPDF2 et le
+    document pdfplumber ne sont construits qu'au premier besoin puis
+    réutilisés. Le texte de chaque page est mis en cache par méthode
+    d'extraction, si bien que valider, afficher les infos et extraire le
+    texte d'un même upload ne parse le document qu'une fois par moteur.
+    """
+    
+    # Temps CPU maximal par page (activé dans les processus d'extraction)
+    page_cpu_seconds: Optional[float] = None
+    
+    def __init__(self, data: Buffer, name: Optional[str] = None, path: Optional[str] = None):
+        """
+        Args:
+            data: Contenu binaire du PDF (bytes ou memoryview, jamais copié)
+            name: Nom du fichier (affichage)
+            path: Chemin du fichier s'il est mappé depuis le disque
+        """
+        self.data = data
+        self.name = name
+        self.path = path
+        self._reader = None
+        self._plumber = None
+        self._page_text = {}
+        self._sha256 = None
+    
+    @classmethod
+    def from_file(cls, pdf_file) -> "ParsedPDF":
+        """
+        Construit le document depuis un UploadedFile Streamlit, un fichier
+        ouvert, des octets, une memoryview ou un chemin (fichier mappé)
+        """
+        if isinstance(pdf_file, ParsedPDF):
+            return pdf_file
+        
+        data, name, _, path = read_buffer(pdf_file)
+        return cls(data, name=name, path=path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Libère le document pdfplumber (le texte déjà extrait reste en cache)"""
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+    
+    @property
+    def reader(self) -> PyPDF2.PdfReader:
+        if self._reader is None:
+            self._reader = PyPDF2.PdfReader(BufferStream(self.data))
+        return self._reader
+    
+    @property
+    def plumber(self):
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(BufferStream(self.data))
+        return self._plumber
+    
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+    
+    @property
+    def sha256(self) -> str:
+        """Empreinte du contenu (clé du cache d'extraction)"""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+    
+    @property
+    def num_pages(self) -> int:
+        return self.page_count()
+    
+    def page_count(self, method: str = "pypdf") -> int:
+        """
+        Nombre de pages lu par le moteur de la méthode, l'autre en secours
+        
+        Un PDF refusé par PyPDF2 reste ainsi extractible avec pdfplumber
+        (et inversement).
+        """
+        engines = ("plumber", "reader") if method in PLUMBER_METHODS else ("reader", "plumber")
+        try:
+            return len(getattr(self, engines[0]).pages)
+        except Exception:
+            return len(getattr(self, engines[1]).pages)
+    
+    @property
+    def encrypted(self) -> bool:
+        return self.reader.is_encrypted
+    
+    @property
+    def metadata(self) -> dict:
+        """Métadonnées du document (titre, auteur, producteur...)"""
+        try:
+            metadata = self.reader.metadata or {}
+        except Exception:
+            return {}
+        return {str(key).lstrip('/'): str(value) for key, value in metadata.items()}
+    
+    def page_text(self, index: int, method: str = "pdfplumber", cache: bool = True) -> str:
+        """
+        Texte d'une page
+        
+        Args:
+            index: Numéro de page (0 = première)
+            method: 'pdfplumber', 'pypdf', 'adaptive' ou 'columns'
+            cache: Conserve le texte sur le document (relectures sans ré-extraction)
+        """
+        key = (method, index)
+        if key in self._page_text:
+            return self._page_text[key]
+        
+        if method == "adaptive":
+            text = self._adaptive_page_text(index, cache)
+        else:
+            with page_cpu_limit(self.page_cpu_seconds):
+                if method == "columns":
+                    text = extract_columns_text(self.plumber.pages[index])
+                elif method == "pdfplumber":
+                    text = self.plumber.pages[index].extract_text()
+                else:
+                    text = self.reader.pages[index].extract_text()
+        
+        text = text or ""
+        if cache:
+            self._page_text[key] = text
+        return text
+    
+    def _adaptive_page_text(self, index: int, cache: bool = True) -> str:
+        """
+        PyPDF2 (rapide) d'abord; pdfplumber seulement si le texte obtenu est
+        de mauvaise qualité (page vide, glyphes illisibles, mots collés)
+        """
+        try:
+            fast_text = self.page_text(index, "pypdf", cache)
+        except Exception:
+            fast_text = ""
+        
+        fast_quality = page_quality(fast_text)
+        if fast_quality >= PDF_PAGE_QUALITY_THRESHOLD:
+            record_page(fallback=False)
+            return fast_text
+        
+        record_page(fallback=True)
+        try:
+            precise_text = self.page_text(index, "pdfplumber", cache)
+        except Exception:
+            return fast_text
+        
+        # pdfplumber ne fait pas toujours mieux (page scannée): garder le meilleur
+        return precise_text if page_quality(precise_text) >= fast_quality else fast_text
+    
+    def iter_pages(self, method: str = "pdfplumber", max_pages: Optional[int] = None,
+                   max_chars: Optional[int] = None) -> Iterator[str]:
+        """
+        Texte des pages non vides, extrait au fur et à mesure de la lecture
+        
+        Les pages au-delà de `max_pages` ne sont jamais extraites; la page
+        qui atteint `max_chars` est tronquée et l'itération s'arrête. Avec
+        une limite, le texte des pages n'est pas conservé sur le document:
+        seule la page en cours est en mémoire.
+        """
+        total = self.page_count(method)
+        num_pages = total if max_pages is None else min(total, max_pages)
+        remaining = max_chars
+        cache = max_pages is None and max_chars is None
+        
+        for index in range(num_pages):
+            text = self.page_text(index, method, cache)
+            if not text:
+                continue
+            
+            if remaining is not None:
+                if len(text) >= remaining:
+                    yield text[:remaining]
+                    return
+                remaining -= len(text)
+            
+            yield text
+    
+    def text(self, method: str = "pdfplumber", max_pages: Optional[int] = None,
+             max_chars: Optional[int] = None) -> str:
+        """Texte du document, pages séparées par un saut de page (PAGE_SEPARATOR)"""
+        return PAGE_SEPARATOR.join(self.iter_pages(method, max_pages, max_chars)).strip()
\ No newline at end of file
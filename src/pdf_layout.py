@@ -0,0 +1,92 @@
+"""
+Extraction tenant compte des colonnes (CVs en deux colonnes)
+"""
+import numpy as np
+
+# Largeur minimale (points PDF) d'une gouttière entre deux colonnes
+MIN_GUTTER_WIDTH = 15
+# Part des lignes autorisées à traverser la gouttière (titre centré, nom...)
+GUTTER_TOLERANCE = 0.1
+# Part minimale des mots par colonne: des dates alignées à droite
+# ne forment pas une colonne
+MIN_COLUMN_SHARE = 0.15
+MAX_COLUMNS = 3
+# Écart vertical (points) en dessous duquel deux mots sont sur la même ligne
+LINE_TOLERANCE = 3
+
+def find_column_boundaries(x0: np.ndarray, x1: np.ndarray, num_lines: int) -> np.ndarray:
+    """
+    Abscisses séparant les colonnes (tableau vide = une seule colonne)
+    
+    La couverture horizontale de la page est calculée en une passe: +1 au
+    début de chaque mot, -1 à sa fin, somme cumulée. Une gouttière est une
+    bande assez large que (presque) aucun mot ne recouvre.
+    """
+    start, end = int(np.floor(x0.min())), int(np.ceil(x1.max()))
+    if end - start < 3 * MIN_GUTTER_WIDTH:
+        return np.empty(0)
+    
+    edges = np.zeros(end - start + 2, dtype=np.int64)
+    np.add.at(edges, np.floor(x0).astype(np.int64) - start, 1)
+    np.add.at(edges, np.ceil(x1).astype(np.int64) - start, -1)
+    coverage = np.cumsum(edges)[:-1]
+    
+    free = coverage <= GUTTER_TOLERANCE * num_lines
+    # Début et fin de chaque bande libre
+    changes = np.flatnonzero(np.diff(np.concatenate(([0], free.astype(np.int8), [0]))))
+    runs = changes.reshape(-1, 2)
+    # Les marges (bandes touchant les bords) ne sont pas des gouttières
+    runs = runs[(runs[:, 0] > 0) & (runs[:, 1] < len(free)) &
+                (runs[:, 1] - runs[:, 0] >= MIN_GUTTER_WIDTH)]
+    if not len(runs):
+        return np.empty(0)
+    
+    # Les plus larges d'abord, dans la limite de MAX_COLUMNS colonnes
+    widest = runs[np.argsort(runs[:, 0] - runs[:, 1])][:MAX_COLUMNS - 1]
+    boundaries = np.sort(start + widest.mean(axis=1))
+    
+    # Colonnes trop maigres: on renonce au découpage correspondant
+    counts = np.bincount(np.searchsorted(boundaries, x0), minlength=len(boundaries) + 1)
+    while len(boundaries) and counts.min() < MIN_COLUMN_SHARE * len(x0):
+        weakest = int(np.argmin(counts))
+        boundaries = np.delete(boundaries, min(weakest, len(boundaries) - 1))
+        counts = np.bincount(np.searchsorted(boundaries, x0), minlength=len(boundaries) + 1)
+    
+    return boundaries
+
+def extract_columns_text(page) -> str:
+    """
+    Texte d'une page pdfplumber, colonne par colonne
+    
+    Réutilise les boîtes de mots calculées par pdfplumber (sans le coût du
+    mode layout): regroupement en colonnes, puis en lignes, par tris NumPy.
+    """
+    words = page.extract_words()
+    if not words:
+        return ""
+    
+    x0 = np.fromiter((w['x0'] for w in words), dtype=float, count=len(words))
+    x1 = np.fromiter((w['x1'] for w in words), dtype=float, count=len(words))
+    top = np.fromiter((w['top'] for w in words), dtype=float, count=len(words))
+    
+    num_lines = len(np.unique(np.round(top / LINE_TOLERANCE)))
+    column = np.searchsorted(find_column_boundaries(x0, x1, num_lines), x0)
+    
+    # Colonne puis hauteur: un changement de colonne ou un saut vertical = nouvelle ligne
+    order = np.lexsort((top, column))
+    new_line = np.ones(len(words), dtype=bool)
+    new_line[1:] = (np.diff(column[order]) != 0) | (np.diff(top[order]) > LINE_TOLERANCE)
+    line_id = np.empty(len(words), dtype=np.int64)
+    line_id[order] = np.cumsum(new_line)
+    
+    # Dans chaque ligne, les mots de gauche à droite; ligne vide entre colonnes
+    order = np.lexsort((x0, line_id))
+    lines = []
+    previous_column = None
+    for line in np.split(order, np.flatnonzero(np.diff(line_id[order])) + 1):
+        if previous_column is not None and column[line[0]] != previous_column:
+            lines.append("")
+        lines.append(" ".join(words[i]['text'] for i in line))
+        previous_column = column[line[0]]
+    
+    return "\n".join(lines)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Limites de ressources pour l'analyse des documents (taille, pages, CPU, mémoire)
+"""
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Optional
+from utils.config import MAX_FILE_SIZE_MB, MAX_PDF_PAGE_COUNT
+
+try:
+    import resource
+except ImportError:  # Windows: pas de limites par processus
+    resource = None
+
+class DocumentLimitError(Exception):
+    """Document refusé (tout format): il dépasse une limite de taille ou de ressources"""
+
+class PDFLimitError(DocumentLimitError):
+    """PDF refusé: trop de pages ou page trop coûteuse à extraire"""
+
+def check_size(size_bytes: int):
+    """Refuse un fichier plus gros que MAX_FILE_SIZE_MB (avant tout parsing)"""
+    if size_bytes > MAX_FILE_SIZE_MB * 1024 * 1024:
+        raise DocumentLimitError(
+            f"Fichier trop volumineux ({size_bytes / 1024 / 1024:.1f} MB, max {MAX_FILE_SIZE_MB} MB)"
+        )
+
+def check_document(pdf, method: str = "pypdf"):
+    """Taille puis nombre de pages d'un ParsedPDF (compté par le moteur de `method`)"""
+    check_size(pdf.size_bytes)
+    num_pages = pdf.page_count(method)
+    if num_pages > MAX_PDF_PAGE_COUNT:
+        raise PDFLimitError(f"Trop de pages ({num_pages}, max {MAX_PDF_PAGE_COUNT})")
+
+@contextmanager
+def page_cpu_limit(seconds: Optional[float]):
+    """
+    Interrompt l'extraction d'une page après `seconds` secondes de CPU
+    
+    Repose sur ITIMER_VIRTUAL (temps CPU du processus): sans effet hors du
+    thread principal ou sur une plateforme sans setitimer. Utilisé dans les
+    processus d'extraction, où la boucle tourne dans le thread principal.
+    """
+    if (not seconds or not hasattr(signal, "setitimer") or
+            threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+    
+    def _timeout(signum, frame):
+        raise PDFLimitError(f"Page trop coûteuse à extraire (> {seconds:g}s de CPU)")
+    
+    previous = signal.signal(signal.SIGVTALRM, _timeout)
+    signal.setitimer(signal.ITIMER_VIRTUAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+        signal.signal(signal.SIGVTALRM, previous)
+
+def _address_space_bytes() -> int:
+    """Espace d'adressage déjà occupé (hérité du parent lors d'un fork)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def apply_process_limits(memory_mb: int, cpu_seconds: float):
+    """
+    Plafonne la mémoire et le temps CPU du processus courant
+    
+    À appeler dans le processus d'extraction, jamais dans le serveur: au-delà
+    de la mémoire allouée, les allocations échouent (MemoryError); au-delà
+    du temps CPU, le système tue le processus (SIGXCPU).
+    """
+    if resource is None:
+        return
+    
+    limits = [
+        (resource.RLIMIT_AS, _address_space_bytes() + memory_mb * 1024 * 1024),
+        (resource.RLIMIT_CPU, max(1, int(cpu_seconds)))
+    ]
+    for limit, value in limits:
+        _, hard = resource.getrlimit(limit)
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        try:
+            resource.setrlimit(limit, (value, hard))
+        except (ValueError, OSError):
+            pass
\ No newline at end of file
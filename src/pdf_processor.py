@@ -1,70 +1,208 @@
 """
 Extraction de texte depuis les PDFs
 """
-import PyPDF2
-import pdfplumber
-from typing import Optional
+from typing import Iterator, Optional
+from src.cv_sections import segment_cv
+from src.parsed_pdf import ParsedPDF
+from src.extraction_cache import EXTRACTION_CACHE, make_extraction_key
+from src.pdf_limits import DocumentLimitError, check_document, check_size
+from utils.config import (
+    PDF_WORKERS,
+    PDF_EXTRACTION_TIMEOUT,
+    PDF_EXTRACTION_METHOD,
+    MAX_PDF_PAGES,
+    MAX_EXTRACTED_CHARS
+)
 
 class PDFProcessor:
     """Classe pour extraire le texte des CVs en PDF"""
     
     @staticmethod
-    def extract_text_pypdf(pdf_file) -> str:
+    def parse(pdf_file) -> ParsedPDF:
+        """
+        Ouvre le PDF une seule fois pour toutes les opérations suivantes
+        
+        Args:
+            pdf_file: Fichier PDF uploadé, octets, memoryview, chemin ou ParsedPDF
+        
+        Returns:
+            ParsedPDF: Document à passer à validate_pdf, get_pdf_info et extract_text
+        """
+        return ParsedPDF.from_file(pdf_file)
+    
+    @classmethod
+    def iter_pages(cls, pdf_file, method: str = PDF_EXTRACTION_METHOD,
+                   max_pages: Optional[int] = MAX_PDF_PAGES,
+                   max_chars: Optional[int] = MAX_EXTRACTED_CHARS) -> Iterator[str]:
+        """
+        Générateur du texte page par page, avec arrêt anticipé
+        
+        Seules les pages consommées sont extraites: s'arrêter tôt (ou
+        atteindre une limite) évite de parser le reste du document.
+        
+        Args:
+            pdf_file: Fichier PDF uploadé ou ParsedPDF
+            method: 'adaptive', 'columns', 'pdfplumber' ou 'pypdf'
+            max_pages: Nombre maximal de pages lues (None = toutes)
+            max_chars: Nombre maximal de caractères produits (None = illimité)
+        
+        Yields:
+            str: Texte de chaque page non vide
+        """
+        yield from cls.parse(pdf_file).iter_pages(method, max_pages, max_chars)
+    
+    @classmethod
+    def extract_text_pypdf(cls, pdf_file, max_pages: Optional[int] = MAX_PDF_PAGES,
+                           max_chars: Optional[int] = MAX_EXTRACTED_CHARS) -> str:
         """
         Extrait le texte avec PyPDF2 (méthode simple)
         """
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text.strip()
+            return cls.parse(pdf_file).text("pypdf", max_pages, max_chars)
         except Exception as e:
             raise Exception(f"Erreur PyPDF2: {str(e)}")
     
-    @staticmethod
-    def extract_text_pdfplumber(pdf_file) -> str:
+    @classmethod
+    def extract_text_pdfplumber(cls, pdf_file, max_pages: Optional[int] = MAX_PDF_PAGES,
+                                max_chars: Optional[int] = MAX_EXTRACTED_CHARS) -> str:
         """
         Extrait le texte avec pdfplumber (plus précis)
         """
         try:
-            text = ""
-            
-            with pdfplumber.open(pdf_file) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            return text.strip()
+            return cls.parse(pdf_file).text("pdfplumber", max_pages, max_chars)
         except Exception as e:
             raise Exception(f"Erreur pdfplumber: {str(e)}")
     
     @classmethod
-    def extract_text(cls, pdf_file, method: str = "pdfplumber") -> str:
+    def extract_text_adaptive(cls, pdf_file, max_pages: Optional[int] = MAX_PDF_PAGES,
+                              max_chars: Optional[int] = MAX_EXTRACTED_CHARS) -> str:
+        """
+        Extrait le texte avec PyPDF2, en ne repassant que les pages mal
+        extraites par pdfplumber (la plupart des CVs texte prennent le
+        chemin rapide)
+        """
+        try:
+            return cls.parse(pdf_file).text("adaptive", max_pages, max_chars)
+        except Exception as e:
+            raise Exception(f"Erreur extraction adaptative: {str(e)}")
+    
+    @classmethod
+    def extract_text_columns(cls, pdf_file, max_pages: Optional[int] = MAX_PDF_PAGES,
+                             max_chars: Optional[int] = MAX_EXTRACTED_CHARS) -> str:
+        """
+        Extrait le texte colonne par colonne (CVs en deux colonnes) à partir
+        des positions des mots calculées par pdfplumber
+        """
+        try:
+            return cls.parse(pdf_file).text("columns", max_pages, max_chars)
+        except Exception as e:
+            raise Exception(f"Erreur extraction par colonnes: {str(e)}")
+    
+    @classmethod
+    def extract_text(cls, pdf_file, method: str = PDF_EXTRACTION_METHOD,
+                     max_pages: Optional[int] = MAX_PDF_PAGES,
+                     max_chars: Optional[int] = MAX_EXTRACTED_CHARS) -> str:
         """
         Extrait le texte avec la méthode spécifiée
         
         Args:
-            pdf_file: Fichier PDF uploadé
-            method: 'pdfplumber' ou 'pypdf'
+            pdf_file: Fichier PDF uploadé ou ParsedPDF
+            method: 'adaptive', 'columns', 'pdfplumber' ou 'pypdf'
+            max_pages: Nombre maximal de pages lues
+            max_chars: Nombre maximal de caractères conservés
         
         Returns:
             str: Texte extrait du PDF
         """
-        if method == "pdfplumber":
+        pdf = cls.parse(pdf_file)
+        check_size(pdf.size_bytes)
+        
+        # Un fichier déjà extrait (re-upload, rerun Streamlit) n'est pas re-parsé
+        cache_key = make_extraction_key(pdf.sha256, method, max_pages, max_chars)
+        if cache_key:
+            cached = EXTRACTION_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        check_document(pdf, method)
+        
+        if method == "adaptive":
+            try:
+                text = cls.extract_text_adaptive(pdf, max_pages, max_chars)
+            except:
+                # PDF refusé par PyPDF2: extraction complète par pdfplumber
+                text = cls.extract_text_pdfplumber(pdf, max_pages, max_chars)
+        elif method == "columns":
+            try:
+                text = cls.extract_text_columns(pdf, max_pages, max_chars)
+            except:
+                text = cls.extract_text_pypdf(pdf, max_pages, max_chars)
+        elif method == "pdfplumber":
             try:
-                return cls.extract_text_pdfplumber(pdf_file)
+                text = cls.extract_text_pdfplumber(pdf, max_pages, max_chars)
             except:
                 # Fallback sur PyPDF2 si pdfplumber échoue
-                return cls.extract_text_pypdf(pdf_file)
+                text = cls.extract_text_pypdf(pdf, max_pages, max_chars)
         else:
-            return cls.extract_text_pypdf(pdf_file)
+            text = cls.extract_text_pypdf(pdf, max_pages, max_chars)
+        
+        if cache_key and text:
+            EXTRACTION_CACHE.set(cache_key, text)
+        return text
     
-    @staticmethod
-    def validate_pdf(pdf_file) -> tuple[bool, Optional[str]]:
+    @classmethod
+    def extract_many(cls, pdf_files, method: str = PDF_EXTRACTION_METHOD,
+                     max_workers: int = PDF_WORKERS,
+                     timeout: float = PDF_EXTRACTION_TIMEOUT) -> Iterator[dict]:
+        """
+        Extrait le texte d'un lot de documents en parallèle, dans des processus séparés
+        
+        Un fichier en erreur ou trop lent (tué après `timeout` secondes)
+        n'interrompt pas le lot: son erreur est renvoyée avec les autres
+        résultats. Les DOCX et TXT sont acceptés (voir document_extractors).
+        
+        Args:
+            pdf_files: Octets, fichiers uploadés ou ParsedPDF
+            method: 'adaptive', 'columns', 'pdfplumber' ou 'pypdf'
+            max_workers: Nombre de processus simultanés
+            timeout: Délai maximal par fichier (secondes)
+        
+        Yields:
+            dict: {'index', 'name', 'format', 'text', 'error'} dans l'ordre de fin d'extraction
+        """
+        # Import tardif: le registre des formats s'appuie sur PDFProcessor
+        from src.document_extractors import extract_documents
+        
+        yield from extract_documents(pdf_files, method, max_workers, timeout)
+    
+    @classmethod
+    def extract_text_isolated(cls, pdf_file, method: str = PDF_EXTRACTION_METHOD,
+                              timeout: float = PDF_EXTRACTION_TIMEOUT) -> str:
+        """
+        Extrait le texte d'un seul PDF dans un processus bridé et interruptible
+        
+        À préférer à extract_text pour un fichier uploadé: un document piégé
+        (bombe de décompression, pages démesurées) ne ralentit pas le serveur.
+        
+        Raises:
+            Exception: Limite dépassée, délai expiré ou PDF illisible
+        """
+        from src.document_extractors import extract_document_isolated
+        
+        return extract_document_isolated(pdf_file, method, timeout)
+    
+    @classmethod
+    def extract_sections(cls, pdf_file, method: str = PDF_EXTRACTION_METHOD) -> list:
+        """
+        Extrait le texte puis le découpe en sections (compétences, expérience...)
+        
+        Returns:
+            list: Sections {'name', 'heading', 'text', 'start', 'end'} (voir cv_sections)
+        """
+        return segment_cv(cls.extract_text(pdf_file, method))
+    
+    @classmethod
+    def validate_pdf(cls, pdf_file) -> tuple[bool, Optional[str]]:
         """
         Valide que le fichier est un PDF valide et lisible
         
@@ -72,24 +210,20 @@ class PDFProcessor:
             tuple: (is_valid, error_message)
         """
         try:
-            # Réinitialiser le pointeur
-            pdf_file.seek(0)
-            
-            # Tester la lecture
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            pdf = cls.parse(pdf_file)
+            check_document(pdf)
             
-            if len(pdf_reader.pages) == 0:
+            if pdf.num_pages == 0:
                 return False, "Le PDF est vide"
             
-            # Réinitialiser à nouveau pour la lecture ultérieure
-            pdf_file.seek(0)
-            
             return True, None
+        except DocumentLimitError as e:
+            return False, str(e)
         except Exception as e:
             return False, f"PDF invalide: {str(e)}"
     
-    @staticmethod
-    def get_pdf_info(pdf_file) -> dict:
+    @classmethod
+    def get_pdf_info(cls, pdf_file) -> dict:
         """
         Récupère les informations du PDF
         
@@ -97,16 +231,13 @@ class PDFProcessor:
             dict: Informations (nombre de pages, taille, etc.)
         """
         try:
-            pdf_file.seek(0)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            pdf = cls.parse(pdf_file)
             
-            info = {
-                "num_pages": len(pdf_reader.pages),
-                "size_bytes": pdf_file.size if hasattr(pdf_file, 'size') else None,
-                "encrypted": pdf_reader.is_encrypted
+            return {
+                "num_pages": pdf.num_pages,
+                "size_bytes": pdf.size_bytes,
+                "encrypted": pdf.encrypted,
+                "metadata": pdf.metadata
             }
-            
-            pdf_file.seek(0)
-            return info
         except Exception as e:
             return {"error": str(e)}
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Extraction de documents dans des processus séparés (parallèle, interruptible)
+"""
+import multiprocessing
+import signal
+import time
+from multiprocessing.connection import wait
+from typing import Iterator
+from src.pdf_limits import apply_process_limits
+from utils.buffers import open_handle
+from utils.config import PDF_EXTRACTION_TIMEOUT, PDF_WORKER_MEMORY_MB, PDF_PAGE_CPU_SECONDS
+
+# Jamais "fork": le serveur Streamlit est multi-thread, un enfant forké
+# hériterait de verrous tenus par d'autres threads (logging, SQLite...)
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+def _extract_worker(conn, handle: tuple, method: str, document_format: str = "pdf",
+                    with_info: bool = False):
+    """
+    Point d'entrée du processus: extrait le texte et renvoie (succès, résultat)
+    
+    Avec `with_info`, le résultat est celui de inspect_document (validation,
+    informations et texte).
+    
+    Le processus est bridé (mémoire, CPU total, CPU par page) avant de
+    toucher au fichier: un document piégé n'épuise que son propre processus.
+    """
+    # Import tardif: le module est chargé par le processus enfant
+    from src.document_extractors import extract_document, inspect_document
+    from src.parsed_pdf import ParsedPDF
+    
+    try:
+        apply_process_limits(PDF_WORKER_MEMORY_MB, PDF_EXTRACTION_TIMEOUT)
+        ParsedPDF.page_cpu_seconds = PDF_PAGE_CPU_SECONDS
+        # Le document est lu en place (mémoire partagée ou fichier mappé)
+        with open_handle(handle) as data:
+            if with_info:
+                result = inspect_document(data, method, document_format)
+            else:
+                result = extract_document(data, method, document_format=document_format)
+        conn.send((True, result))
+    except MemoryError:
+        conn.send((False, f"Mémoire insuffisante (limite {PDF_WORKER_MEMORY_MB} MB)"))
+    except Exception as e:
+        conn.send((False, str(e)))
+    finally:
+        conn.close()
+
+def _exit_reason(exitcode: int) -> str:
+    if exitcode is not None and exitcode < 0:
+        try:
+            return f"signal {signal.Signals(-exitcode).name}"
+        except ValueError:
+            pass
+    return f"code {exitcode}"
+
+def _stop(process, conn):
+    if process.is_alive():
+        process.kill()
+    process.join()
+    conn.close()
+
+def _get_context():
+    context = multiprocessing.get_context(START_METHOD)
+    if START_METHOD == "forkserver":
+        # Modules d'extraction importés une fois par le serveur, pas par chaque enfant
+        context.set_forkserver_preload(["src.document_extractors"])
+    return context
+
+def run_in_workers(jobs: list, target=_extract_worker, max_workers: int = 4,
+                   timeout: float = 30) -> Iterator[tuple]:
+    """
+    Exécute `target(conn, *args)` pour chaque job, un processus par job
+    
+    Contrairement à un ProcessPoolExecutor, chaque fichier a son propre
+    processus: celui qui dépasse son délai (PDF pathologique) est tué sans
+    bloquer le lot ni laisser un worker occupé indéfiniment.
+    
+    Args:
+        jobs: Arguments de `target` pour chaque tâche (tuples), liste ou générateur
+        target: Fonction exécutée dans le processus enfant
+        max_workers: Processus simultanés
+        timeout: Délai maximal par tâche (secondes)
+    
+    Yields:
+        tuple: (index du job, succès, texte ou message d'erreur), dans l'ordre de fin
+    """
+    context = _get_context()
+    # Les jobs sont consommés au fur et à mesure (préparation paresseuse)
+    pending = enumerate(jobs)
+    next_job = next(pending, None)
+    running = {}  # connexion -> (index, processus, échéance)
+    
+    try:
+        while next_job is not None or running:
+            while next_job is not None and len(running) < max(1, max_workers):
+                index, args = next_job
+                next_job = next(pending, None)
+                recv_conn, send_conn = context.Pipe(duplex=False)
+                process = context.Process(target=target, args=(send_conn, *args), daemon=True)
+                process.start()
+                send_conn.close()
+                running[recv_conn] = (index, process, time.monotonic() + timeout)
+            
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            ready = wait(list(running), timeout=max(0.0, next_deadline - time.monotonic()))
+            
+            for conn in ready:
+                index, process, _ = running.pop(conn)
+                try:
+                    success, payload = conn.recv()
+                except EOFError:
+                    process.join()
+                    success, payload = False, f"Processus d'extraction interrompu ({_exit_reason(process.exitcode)})"
+                _stop(process, conn)
+                yield index, success, payload
+            
+            now = time.monotonic()
+            for conn, (index, process, deadline) in list(running.items()):
+                if deadline <= now:
+                    del running[conn]
+                    _stop(process, conn)
+                    yield index, False, f"Délai d'extraction dépassé ({timeout:g}s)"
+    finally:
+        # Lot abandonné (générateur fermé, exception): aucun processus orphelin
+        for conn, (_, process, _) in running.items():
+            _stop(process, conn)
\ No newline at end of file
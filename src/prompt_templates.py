@@ -91,28 +91,103 @@ Exemple: ["Ajouter une section 'Projets' avec 2-3 réalisations concrètes en Py
 
 Réponds UNIQUEMENT avec la liste Python, sans texte supplémentaire."""
 
-RECRUITER_ANALYSIS_PROMPT = """En tant que recruteur, analyse ces multiples CVs par rapport à l'offre d'emploi.
+CANDIDATE_SCORING_PROMPT = """En tant que recruteur, évalue ce CV par rapport à l'offre d'emploi.
 
 **OFFRE D'EMPLOI:**
 {job_offer}
 
-**CVS DES CANDIDATS:**
-{cvs_text}
+**CV DU CANDIDAT ({candidate_name}):**
+{cv_text}
+
+**MISSION:**
+Évalue ce candidat seul et fournis un JSON:
+
+{{
+  "candidat": "{candidate_name}",
+  "score": <0-100>,
+  "points_forts": [<2-3 points forts>],
+  "reserves": [<2-3 réserves>],
+  "recommandation": "<Recommandé/À considérer/Non retenu>"
+}}
+
+Réponds UNIQUEMENT avec le JSON."""
+
+RANKING_SYNTHESIS_PROMPT = """En tant que recruteur, rédige une synthèse comparative des candidats déjà évalués pour cette offre.
+
+**OFFRE D'EMPLOI:**
+{job_offer}
+
+**CLASSEMENT (du meilleur au moins bon):**
+{ranking_summary}
+
+**MISSION:**
+Rédige un paragraphe comparatif de 3-5 phrases: profils qui se détachent, écarts principaux, recommandation pour la suite du processus.
+
+Réponds UNIQUEMENT avec le paragraphe, sans titre."""
+
+
+FULL_PACKAGE_PROMPT = """Analyse ce CV par rapport à l'offre d'emploi, puis propose des améliorations et rédige une lettre de motivation.
+
+**CV DU CANDIDAT:**
+{cv_text}
+
+**OFFRE D'EMPLOI:**
+{job_offer}
 
 **MISSION:**
-Classe les candidats par ordre de pertinence et fournis un JSON:
+Fournis un JSON unique avec la structure suivante:
 
 {{
-  "classement": [
-    {{
-      "candidat": "<nom ou CV1, CV2, etc>",
-      "score": <0-100>,
-      "points_forts": [<2-3 points forts>],
-      "reserves": [<2-3 réserves>],
-      "recommandation": "<Recommandé/À considérer/Non retenu>"
-    }}
-  ],
-  "synthese": "<paragraphe comparatif>"
+  "analyse": {{
+    "score_global": <nombre entre 0 et 100>,
+    "competences_techniques": {{
+      "presentes": [<compétences techniques du candidat qui matchent>],
+      "manquantes": [<compétences techniques requises mais absentes>],
+      "score": <nombre entre 0 et 100>
+    }},
+    "experience": {{
+      "annees_experience": <nombre d'années estimé>,
+      "pertinence": "<court texte sur la pertinence de l'expérience>",
+      "score": <nombre entre 0 et 100>
+    }},
+    "formation": {{
+      "niveau": "<niveau de formation du candidat>",
+      "adequation": "<court texte sur l'adéquation avec le poste>",
+      "score": <nombre entre 0 et 100>
+    }},
+    "soft_skills": {{
+      "identifies": [<soft skills identifiées>],
+      "manquantes": [<soft skills souhaitées mais non mentionnées>]
+    }},
+    "points_forts": [<3-5 points forts du candidat pour ce poste>],
+    "points_amelioration": [<3-5 suggestions concrètes d'amélioration du CV>],
+    "synthese": "<paragraphe de synthèse de 3-4 phrases>"
+  }},
+  "suggestions": [<5 suggestions commençant par un verbe d'action, spécifiques, réalistes, visant à augmenter le score>],
+  "lettre_motivation": "<lettre en français, ton professionnel mais chaleureux, intro + 2-3 paragraphes + conclusion, 250-300 mots, exemples concrets du CV, sans mentionner le score>"
 }}
 
-Réponds UNIQUEMENT avec le JSON."""
\ No newline at end of file
+Réponds UNIQUEMENT avec le JSON, sans texte avant ou après."""
+
+
+REPAIR_JSON_PROMPT = """La réponse ci-dessous devait être {expected} valide mais n'a pas pu être interprétée.
+
+**ERREUR:**
+{error}
+
+**RÉPONSE À CORRIGER:**
+{response}
+
+Corrige uniquement la syntaxe (guillemets, virgules, accolades, crochets) et complète la fin si elle est tronquée, sans modifier le contenu.
+Réponds UNIQUEMENT avec {expected} corrigé."""
+
+
+TRIAGE_PROMPT = """Évalue rapidement l'adéquation de ce CV avec l'offre d'emploi.
+
+**OFFRE D'EMPLOI:**
+{job_offer}
+
+**CV:**
+{cv_text}
+
+Réponds UNIQUEMENT avec un JSON: {{"score": <0-100>}}"""
@@ -0,0 +1,212 @@
+"""
+Ordonnancement des appels Groq: quotas par clé, retries et backoff
+"""
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+import groq
+from utils.config import (
+    GROQ_RPM_LIMIT,
+    GROQ_TPM_LIMIT,
+    MAX_RETRIES,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY
+)
+
+WINDOW_SECONDS = 60
+
+class RateLimitScheduler:
+    """
+    Régule les appels d'une clé API pour rester sous les quotas du fournisseur
+    
+    Les requêtes et les tokens des 60 dernières secondes sont comptés dans
+    une fenêtre glissante: une requête qui dépasserait le quota attend son
+    tour au lieu d'échouer. En cas d'erreur 429, l'en-tête `retry-after`
+    suspend toutes les requêtes de la clé; les autres erreurs transitoires
+    (5xx, réseau, délai) sont retentées avec un backoff exponentiel aléatoire.
+    """
+    
+    def __init__(self, rpm_limit: int = GROQ_RPM_LIMIT, tpm_limit: int = GROQ_TPM_LIMIT,
+                 max_retries: int = MAX_RETRIES, base_delay: float = RETRY_BASE_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        self._lock = threading.Lock()
+        self._window = deque()  # [horodatage, tokens] par requête
+        self._paused_until = 0.0
+        
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "waited_seconds": 0.0}
+    
+    def _try_reserve(self, tokens: int) -> tuple[Optional[list], float]:
+        """
+        Réserve une place dans la fenêtre si le quota le permet
+        
+        Returns:
+            tuple: (réservation, 0) ou (None, secondes à attendre)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return None, self._paused_until - now
+            
+            while self._window and now - self._window[0][0] >= WINDOW_SECONDS:
+                self._window.popleft()
+            
+            used_tokens = sum(entry[1] for entry in self._window)
+            # Une requête plus grosse que le quota passe seule, fenêtre vide
+            fits_tokens = used_tokens + tokens <= self.tpm_limit or not self._window
+            
+            if len(self._window) < self.rpm_limit and fits_tokens:
+                reservation = [now, tokens]
+                self._window.append(reservation)
+                return reservation, 0.0
+            
+            return None, max(0.05, WINDOW_SECONDS - (now - self._window[0][0]))
+    
+    def acquire(self, tokens: int) -> list:
+        """Attend (bloquant) qu'une requête de `tokens` tokens puisse partir"""
+        while True:
+            reservation, wait = self._try_reserve(tokens)
+            if reservation is not None:
+                return reservation
+            self.stats["waited_seconds"] += wait
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens: int) -> list:
+        """Version asynchrone d'`acquire` (n'occupe pas la boucle d'événements)"""
+        while True:
+            reservation, wait = self._try_reserve(tokens)
+            if reservation is not None:
+                return reservation
+            self.stats["waited_seconds"] += wait
+            await asyncio.sleep(wait)
+    
+    def record_usage(self, reservation: list, response):
+        """Remplace l'estimation réservée par la consommation réelle"""
+        usage = getattr(response, 'usage', None)
+        if usage is not None and usage.total_tokens:
+            with self._lock:
+                reservation[1] = usage.total_tokens
+    
+    def _release_tokens(self, reservation: list):
+        """Une requête échouée compte pour le quota de requêtes, pas de tokens"""
+        with self._lock:
+            reservation[1] = 0
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Délai avant nouvelle tentative, ou None si l'erreur est définitive
+        """
+        if attempt >= self.max_retries:
+            return None
+        
+        if isinstance(error, groq.RateLimitError):
+            self.stats["rate_limited"] += 1
+            retry_after = _retry_after_seconds(error)
+            if retry_after is not None:
+                delay = retry_after + random.uniform(0, self.base_delay)
+            else:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt + 1)))
+            # Toute la clé est suspendue, pas seulement cette requête
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            return delay
+        
+        transient = (
+            isinstance(error, (groq.APIConnectionError, groq.APITimeoutError)) or
+            (isinstance(error, groq.APIStatusError) and error.status_code >= 500)
+        )
+        if not transient:
+            return None
+        
+        # Backoff exponentiel avec jitter complet
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt + 1)))
+    
+    def execute(self, request, tokens: int):
+        """
+        Exécute `request()` en respectant les quotas et en retentant si besoin
+        
+        Args:
+            request: Fonction sans argument qui effectue l'appel API
+            tokens: Estimation des tokens consommés (prompt + réponse max)
+        """
+        attempt = 0
+        while True:
+            reservation = self.acquire(tokens)
+            self.stats["requests"] += 1
+            try:
+                response = request()
+            except Exception as e:
+                self._release_tokens(reservation)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                self.stats["retries"] += 1
+                time.sleep(delay)
+                continue
+            
+            self.record_usage(reservation, response)
+            return response
+    
+    async def execute_async(self, request, tokens: int):
+        """
+        Version asynchrone d'`execute`: `request()` retourne une coroutine
+        """
+        attempt = 0
+        while True:
+            reservation = await self.acquire_async(tokens)
+            self.stats["requests"] += 1
+            try:
+                response = await request()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._release_tokens(reservation)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+            
+            self.record_usage(reservation, response)
+            return response
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Lit l'en-tête retry-after d'une réponse 429"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    
+    headers = response.headers
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        return None
+    return None
+
+# Un ordonnanceur par couple (clé API, modèle): les quotas Groq sont par modèle
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+def get_scheduler(api_key: str, model: str) -> RateLimitScheduler:
+    """Ordonnanceur partagé par tous les analyseurs d'une même clé et d'un même modèle"""
+    key = (hashlib.sha256(api_key.encode('utf-8')).hexdigest(), model)
+    
+    with _schedulers_lock:
+        if key not in _schedulers:
+            _schedulers[key] = RateLimitScheduler()
+        return _schedulers[key]
\ No newline at end of file
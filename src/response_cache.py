@@ -0,0 +1,32 @@
+"""
+Cache persistant des réponses de l'API Groq
+"""
+from typing import Optional
+from utils.disk_cache import DiskCache
+from utils.config import (
+    CACHE_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_TTL_HOURS,
+    LLM_CACHE_MAX_MB,
+    LLM_CACHE_MAX_TEMPERATURE
+)
+
+# Partagé par tous les analyseurs du processus
+RESPONSE_CACHE = DiskCache(
+    CACHE_DIR / "llm",
+    max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=LLM_CACHE_TTL_HOURS * 3600
+)
+
+def make_cache_key(model: str, system_prompt: str, prompt: str,
+                   temperature: float, max_tokens: int) -> Optional[str]:
+    """
+    Clé de cache d'un appel, ou None si l'appel ne doit pas être mis en cache
+    """
+    if not LLM_CACHE_ENABLED or temperature > LLM_CACHE_MAX_TEMPERATURE:
+        return None
+    return DiskCache.make_key(model, system_prompt, prompt, temperature, max_tokens)
+
+def get_cache_stats() -> dict:
+    """Compteurs hits/misses du cache de réponses"""
+    return RESPONSE_CACHE.stats()
@@ -0,0 +1,278 @@
+"""
+Interprétation robuste des réponses structurées (JSON) du modèle
+"""
+import ast
+import json
+import re
+import threading
+from typing import Optional
+
+class StructuredOutputError(Exception):
+    """Réponse du modèle impossible à interpréter, même après réparation"""
+
+_metrics_lock = threading.Lock()
+PARSE_METRICS = {
+    "attempts": 0,       # réponses à interpréter
+    "direct": 0,         # JSON valide tel quel
+    "repaired": 0,       # réparé localement (virgules, guillemets, troncature)
+    "failed": 0,         # échec du parsing local
+    "retry_success": 0,  # réparé par un appel de réparation au modèle
+    "retry_failed": 0,   # échec définitif
+}
+
+FENCE_RE = re.compile(r"```(?:json|python)?", re.I)
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+JSON_LITERAL_RE = re.compile(r"\b(?:true|false|null)\b")
+PYTHON_LITERALS = {"true": "True", "false": "False", "null": "None"}
+# Caractères après lesquels une apostrophe ouvre une chaîne Python (['a', 'b'])
+QUOTE_OPENERS = ('[', '{', ',', ' ', ':', '\n')
+
+def _record(metric: str):
+    with _metrics_lock:
+        PARSE_METRICS[metric] += 1
+
+def record_repair_retry(success: bool):
+    """Comptabilise le résultat d'un appel de réparation"""
+    _record("retry_success" if success else "retry_failed")
+
+def get_parse_metrics() -> dict:
+    """Compteurs et taux d'échec du parsing depuis le démarrage du processus"""
+    with _metrics_lock:
+        metrics = dict(PARSE_METRICS)
+    attempts = metrics["attempts"]
+    metrics["failure_rate"] = metrics["failed"] / attempts if attempts else 0.0
+    metrics["final_failure_rate"] = metrics["retry_failed"] / attempts if attempts else 0.0
+    return metrics
+
+def extract_fragment(text: str, opening: str) -> tuple[str, bool]:
+    """
+    Isole le premier objet (ou liste) JSON équilibré du texte
+    
+    Returns:
+        tuple: (fragment, complet) - complet=False si la réponse est tronquée
+    """
+    text = FENCE_RE.sub("", text)
+    
+    start = text.find(opening)
+    if start == -1:
+        raise StructuredOutputError(f"Aucun '{opening}' trouvé dans la réponse")
+    
+    depth = 0
+    in_string = False
+    escape = False
+    quote = None
+    
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == quote:
+                in_string = False
+            continue
+        
+        if char in '"\'':
+            # Apostrophe hors chaîne: seulement comme délimiteur Python (['a', 'b'])
+            if char == "'" and text[i - 1:i] not in QUOTE_OPENERS:
+                continue
+            in_string = True
+            quote = char
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1], True
+    
+    return text[start:], False
+
+def _close_truncated(fragment: str) -> str:
+    """Referme chaîne, listes et objets laissés ouverts par une troncature"""
+    stack = []
+    in_string = False
+    escape = False
+    
+    for char in fragment:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]' and stack:
+            stack.pop()
+    
+    if in_string:
+        fragment += '"'
+    # Un membre incomplet ("cle": ) est retiré plutôt que deviné
+    fragment = re.sub(r',?\s*"[^"]*"\s*:\s*$', "", fragment.rstrip())
+    fragment = fragment.rstrip().rstrip(',')
+    return fragment + "".join(reversed(stack))
+
+def _sub_outside_strings(pattern: re.Pattern, replacement, text: str) -> str:
+    """re.sub appliqué uniquement hors des chaînes (même parcours que extract_fragment)"""
+    parts = []
+    start = 0
+    in_string = False
+    escape = False
+    quote = None
+    
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == quote:
+                in_string = False
+                parts.append(text[start:i + 1])
+                start = i + 1
+            continue
+        
+        if char in '"\'':
+            if char == "'" and text[i - 1:i] not in QUOTE_OPENERS:
+                continue
+            parts.append(pattern.sub(replacement, text[start:i]))
+            start = i
+            in_string = True
+            quote = char
+    
+    tail = text[start:]
+    parts.append(tail if in_string else pattern.sub(replacement, tail))
+    return "".join(parts)
+
+def repair_json(fragment: str, complete: bool = True):
+    """
+    Réparations locales courantes avant de renoncer
+    
+    Blocs markdown, virgules finales, guillemets typographiques, littéraux
+    Python, guillemets simples et réponse tronquée.
+    """
+    candidate = fragment.replace("“", '"').replace("”", '"')
+    if not complete:
+        candidate = _close_truncated(candidate)
+    candidate = _sub_outside_strings(TRAILING_COMMA_RE, r"\1", candidate)
+    
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    
+    # Le texte des chaînes ("disponible: true") n'est jamais réécrit
+    candidate = _sub_outside_strings(
+        JSON_LITERAL_RE, lambda match: PYTHON_LITERALS[match.group()], candidate
+    )
+    
+    try:
+        return ast.literal_eval(candidate)
+    except (ValueError, SyntaxError) as e:
+        raise StructuredOutputError(f"JSON irréparable: {str(e)}")
+
+def parse_json_response(response: str, expected: type = dict):
+    """
+    Extrait et interprète le JSON d'une réponse du modèle
+    
+    Args:
+        response: Texte brut de la réponse
+        expected: dict (objet JSON) ou list (liste)
+    
+    Raises:
+        StructuredOutputError: si aucune valeur du type attendu n'est récupérable
+    """
+    _record("attempts")
+    opening = '{' if expected is dict else '['
+    
+    try:
+        fragment, complete = extract_fragment(response, opening)
+        
+        try:
+            value = json.loads(fragment) if complete else None
+        except json.JSONDecodeError:
+            value = None
+        
+        if value is not None:
+            _record("direct")
+        else:
+            value = repair_json(fragment, complete)
+            _record("repaired")
+        
+        if not isinstance(value, expected):
+            raise StructuredOutputError(f"Type inattendu: {type(value).__name__}")
+        
+        return value
+    except StructuredOutputError:
+        _record("failed")
+        raise
+
+# Nombre en tête d'un score rédigé ("85/100", "85 %", "72,5")
+LEADING_NUMBER_RE = re.compile(r"^\s*(-?\d+(?:[.,]\d+)?)")
+
+def _parse_score(value) -> Optional[int]:
+    """Score borné à 0-100, ou None s'il est inexploitable ("N/A")"""
+    if isinstance(value, str):
+        match = LEADING_NUMBER_RE.match(value)
+        value = match.group(1).replace(",", ".") if match else None
+    try:
+        return max(0, min(100, int(round(float(value)))))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def _as_score(value, field: str) -> int:
+    score = _parse_score(value)
+    if score is None:
+        raise StructuredOutputError(f"Score invalide pour '{field}': {value!r}")
+    return score
+
+def _as_str_list(value) -> list:
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if not isinstance(value, list):
+        return []
+    return [str(item) for item in value if item not in (None, "")]
+
+def validate_analysis(analysis: dict) -> dict:
+    """
+    Valide et normalise le dict d'analyse (structure de ANALYSIS_PROMPT)
+    
+    Les champs secondaires absents reçoivent une valeur vide et les
+    sous-scores illisibles ("N/A") valent 0; seul un `score_global`
+    absent ou inexploitable est bloquant.
+    
+    Raises:
+        StructuredOutputError: structure inexploitable
+    """
+    if not isinstance(analysis, dict):
+        raise StructuredOutputError("L'analyse doit être un objet JSON")
+    if 'score_global' not in analysis:
+        raise StructuredOutputError("Champ 'score_global' manquant")
+    
+    analysis['score_global'] = _as_score(analysis['score_global'], 'score_global')
+    
+    for section in ('competences_techniques', 'experience', 'formation', 'soft_skills'):
+        if not isinstance(analysis.get(section), dict):
+            analysis[section] = {}
+    
+    comp = analysis['competences_techniques']
+    comp['presentes'] = _as_str_list(comp.get('presentes'))
+    comp['manquantes'] = _as_str_list(comp.get('manquantes'))
+    
+    for section in ('competences_techniques', 'experience', 'formation'):
+        analysis[section]['score'] = _parse_score(analysis[section].get('score')) or 0
+    
+    soft = analysis['soft_skills']
+    soft['identifies'] = _as_str_list(soft.get('identifies'))
+    soft['manquantes'] = _as_str_list(soft.get('manquantes'))
+    
+    analysis['points_forts'] = _as_str_list(analysis.get('points_forts'))
+    analysis['points_amelioration'] = _as_str_list(analysis.get('points_amelioration'))
+    analysis['synthese'] = str(analysis.get('synthese') or "")
+    
+    return analysis
\ No newline at end of file
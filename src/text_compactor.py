@@ -0,0 +1,228 @@
+"""
+Compactage des textes (CV, offre) avant envoi au modèle
+"""
+import math
+import re
+import threading
+from functools import lru_cache
+from src.cv_sections import segment_cv
+
+# Priorité de conservation des sections (0 = garder en dernier recours)
+SECTION_PRIORITIES = {
+    "entete": 0,
+    "competences": 0,
+    "experience": 0,
+    "formation": 1,
+    "projets": 1,
+    "certifications": 2,
+    "langues": 2,
+    "centres_interet": 4,
+    "references": 4,
+}
+DEFAULT_PRIORITY = 3
+
+PAGE_NUMBER_RE = re.compile(
+    r"^(?:page\s*)?-?\s*\d{1,3}\s*(?:(?:/|sur|of)\s*\d{1,3})?\s*-?$",
+    re.I
+)
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+# Marque ajoutée aux sections raccourcies (comptée dans le budget)
+TRUNCATION_MARK = " […]"
+# Saut de page entre deux pages extraites (voir ParsedPDF.text)
+PAGE_SEPARATOR = "\f"
+# Lignes examinées en haut et en bas de chaque page (en-têtes / pieds de page)
+PAGE_EDGE_LINES = 3
+
+_stats_lock = threading.Lock()
+COMPACTION_STATS = {"calls": 0, "tokens_before": 0, "tokens_after": 0, "truncated": 0}
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimation locale du nombre de tokens (sans tokenizer du fournisseur)
+    
+    Les modèles Llama/Mixtral découpent les mots en sous-mots d'environ
+    4 caractères; la ponctuation compte pour un token.
+    """
+    return sum(_token_cost(t) for t in TOKEN_RE.findall(text))
+
+def _token_cost(token: str) -> int:
+    return max(1, math.ceil(len(token) / 4))
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Coupe le texte entre deux tokens pour tenir dans max_tokens, marque comprise"""
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARK)
+    if budget <= 0:
+        return ""
+    
+    end = 0
+    for match in TOKEN_RE.finditer(text):
+        budget -= _token_cost(match.group())
+        if budget < 0:
+            break
+        end = match.end()
+    return text[:end] + TRUNCATION_MARK
+
+def normalize_whitespace(text: str) -> str:
+    """Espaces multiples, espaces insécables, lignes vides répétées"""
+    text = text.replace("\xa0", " ").replace("\t", " ").replace("\r", "").replace(PAGE_SEPARATOR, "\n")
+    lines = [re.sub(r" {2,}", " ", line).strip() for line in text.split("\n")]
+    
+    compact = []
+    for line in lines:
+        if not line and (not compact or not compact[-1]):
+            continue
+        compact.append(line)
+    
+    return "\n".join(compact).strip()
+
+def _edge_signatures(lines: list) -> dict:
+    """Position et signature (chiffres masqués) des lignes en haut et en bas de page"""
+    indexes = [i for i, line in enumerate(lines) if line.strip()]
+    signatures = {}
+    for rank, i in enumerate(indexes[:PAGE_EDGE_LINES]):
+        signatures[i] = ("haut", rank, re.sub(r"\d+", "#", lines[i].strip().lower()))
+    for rank, i in enumerate(reversed(indexes[-PAGE_EDGE_LINES:])):
+        signatures.setdefault(i, ("bas", rank, re.sub(r"\d+", "#", lines[i].strip().lower())))
+    return signatures
+
+def remove_page_artifacts(text: str) -> str:
+    """
+    Supprime les numéros de page et les en-têtes/pieds de page répétés
+    
+    Seules les lignes du haut et du bas de chaque page sont candidates:
+    un numéro de page y est supprimé, et une ligne qui revient à la même
+    place (chiffres mis à part) sur au moins la moitié des pages est un
+    en-tête ou un pied de page dont seule la première occurrence est
+    conservée. Le corps des pages n'est jamais touché: une note "4/5" ou
+    les dates d'un poste qui ressemblent à celles du précédent restent.
+    Un texte sans saut de page (DOCX, TXT) est rendu tel quel.
+    """
+    pages = [page.split("\n") for page in text.split(PAGE_SEPARATOR)]
+    if len(pages) < 2:
+        return text
+    
+    page_edges = [_edge_signatures(page) for page in pages]
+    counts = {}
+    for signatures in page_edges:
+        for key in set(signatures.values()):
+            counts[key] = counts.get(key, 0) + 1
+    
+    min_pages = max(2, math.ceil(len(pages) / 2))
+    seen = set()
+    kept = []
+    
+    for page, signatures in zip(pages, page_edges):
+        for i, line in enumerate(page):
+            key = signatures.get(i)
+            if key and PAGE_NUMBER_RE.match(line.strip()):
+                continue
+            if key and counts[key] >= min_pages:
+                if key[2] in seen:
+                    continue
+                seen.add(key[2])
+            kept.append(line)
+    
+    return "\n".join(kept)
+
+def split_sections(text: str) -> list:
+    """
+    Découpe le texte en sections (voir cv_sections.segment_cv)
+    
+    Returns:
+        list: Dicts {'text', 'priority'} dans l'ordre du document
+    """
+    return [
+        {'text': section['text'], 'priority': SECTION_PRIORITIES.get(section['name'], DEFAULT_PRIORITY)}
+        for section in segment_cv(text)
+    ]
+
+def trim_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Réduit le texte à max_tokens en sacrifiant d'abord les sections secondaires
+    
+    Les sections secondaires (loisirs, références...) sont retirées en
+    partant de la fin; si cela ne suffit pas, le budget restant est réparti
+    équitablement: les sections courtes (compétences) restent intactes et
+    seules les plus longues sont raccourcies.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    
+    sections = split_sections(text)
+    for section in sections:
+        section['tokens'] = estimate_tokens(section['text'])
+    total = sum(s['tokens'] for s in sections)
+    
+    for priority in sorted({s['priority'] for s in sections}, reverse=True):
+        if total <= max_tokens or priority <= 1:
+            break
+        for section in reversed(sections):
+            if total <= max_tokens:
+                break
+            if section['priority'] == priority and section['tokens']:
+                total -= section['tokens']
+                section['tokens'] = 0
+                section['text'] = ""
+    
+    sections = [s for s in sections if s['text']]
+    
+    if total > max_tokens:
+        budget = max_tokens
+        remaining = len(sections)
+        for section in sorted(sections, key=lambda s: s['tokens']):
+            share = budget / remaining
+            remaining -= 1
+            if section['tokens'] <= share:
+                budget -= section['tokens']
+                continue
+            section['text'] = _truncate(section['text'], int(share))
+            budget -= estimate_tokens(section['text'])
+    
+    return "\n".join(s['text'] for s in sections if s['text'])
+
+@lru_cache(maxsize=64)
+def _compact(text: str, max_tokens: int) -> tuple:
+    tokens_before = estimate_tokens(text)
+    
+    cleaned = normalize_whitespace(remove_page_artifacts(text))
+    compact = normalize_whitespace(trim_to_budget(cleaned, max_tokens))
+    
+    stats = {
+        "tokens_before": tokens_before,
+        "tokens_after": estimate_tokens(compact),
+        "truncated": compact != cleaned
+    }
+    stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+    
+    return compact, stats
+
+def compact_text(text: str, max_tokens: int) -> tuple[str, dict]:
+    """
+    Normalise et réduit un texte extrait à un budget de tokens
+    
+    Args:
+        text: Texte brut (extraction PDF, offre collée)
+        max_tokens: Budget maximal estimé
+    
+    Returns:
+        tuple: (texte compacté, statistiques de tokens économisés)
+    """
+    if not text:
+        return text, {"tokens_before": 0, "tokens_after": 0, "truncated": False, "tokens_saved": 0}
+    
+    compact, stats = _compact(text, max_tokens)
+    
+    with _stats_lock:
+        COMPACTION_STATS["calls"] += 1
+        COMPACTION_STATS["tokens_before"] += stats["tokens_before"]
+        COMPACTION_STATS["tokens_after"] += stats["tokens_after"]
+        COMPACTION_STATS["truncated"] += int(stats["truncated"])
+    
+    return compact, dict(stats)
+
+def get_compaction_stats() -> dict:
+    """Statistiques cumulées du processus (tokens économisés)"""
+    with _stats_lock:
+        stats = dict(COMPACTION_STATS)
+    stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+    return stats
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""
+Tests des identifiants d'analyse triés dans le temps
+"""
+import threading
+from datetime import datetime, timedelta
+from utils.analysis_ids import ID_LENGTH, id_floor, is_analysis_id, legacy_analysis_id, new_analysis_id
+
+def test_ids_sort_in_creation_order():
+    ids = [new_analysis_id() for _ in range(5000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(len(analysis_id) == ID_LENGTH and is_analysis_id(analysis_id) for analysis_id in ids)
+
+def test_ids_unique_across_threads():
+    results = [[] for _ in range(8)]
+    
+    def generate(bucket):
+        for _ in range(2000):
+            bucket.append(new_analysis_id())
+    
+    threads = [threading.Thread(target=generate, args=(bucket,)) for bucket in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    ids = [analysis_id for bucket in results for analysis_id in bucket]
+    assert len(set(ids)) == len(ids)
+    # Chaque thread voit une suite croissante
+    assert all(bucket == sorted(bucket) for bucket in results)
+
+def test_id_floor_bounds_ids_by_date():
+    now = datetime.now()
+    assert id_floor(now - timedelta(seconds=1)) < new_analysis_id()
+    assert new_analysis_id() < id_floor(now + timedelta(days=1))
+
+def test_legacy_ids_are_deterministic():
+    old_id = "analysis_20240101_120000_abc"
+    converted = legacy_analysis_id(old_id, "2024-01-01T12:00:00")
+    assert converted == legacy_analysis_id(old_id, "2024-01-01T12:00:00")
+    assert is_analysis_id(converted)
+    assert id_floor("2024-01-01T12:00:00") <= converted < id_floor("2024-01-01T12:00:01")
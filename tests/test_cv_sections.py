@@ -0,0 +1,41 @@
+"""
+Tests du découpage local d'un CV en sections
+"""
+import pytest
+from src.cv_sections import detect_heading, select_sections
+
+@pytest.mark.parametrize("line", [
+    "Développeur Full Stack",
+    "Chef de projet",
+    "Projet de migration cloud",
+    "Technologies de l'information",
+    "Formation continue en Python",
+    "Responsable des formations",
+])
+def test_job_title_lines_are_not_headings(line):
+    assert detect_heading(line) is None
+
+@pytest.mark.parametrize("line, section", [
+    ("EXPÉRIENCES PROFESSIONNELLES", "experience"),
+    ("Compétences techniques :", "competences"),
+    ("## Projets personnels", "projets"),
+    ("Formation et diplômes", "formation"),
+    ("Skills & Languages", "competences"),
+    ("Centres d'intérêt", "centres_interet"),
+])
+def test_section_headings(line, section):
+    assert detect_heading(line) == section
+
+def test_triage_keeps_experience_with_job_title():
+    cv = (
+        "Jean Dupont\n"
+        "Expérience professionnelle\n"
+        "Chef de projet\n"
+        "Pilotage d'une équipe de 8 développeurs\n"
+        "Loisirs\n"
+        "Randonnée\n"
+    )
+    selected = select_sections(cv, {"experience"})
+    assert "Chef de projet" in selected
+    assert "Pilotage d'une équipe" in selected
+    assert "Randonnée" not in selected
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Tests de l'historique SQLite (import JSON, pagination, rétention)
+"""
+import json
+from datetime import datetime, timedelta
+from utils.analysis_ids import is_analysis_id, legacy_analysis_id, new_analysis_id
+from utils.history_store import HistoryStore
+
+def make_record(analysis_id=None, timestamp=None, **fields):
+    record = {
+        'id': analysis_id or new_analysis_id(),
+        'timestamp': timestamp or datetime.now().isoformat(),
+        'type': 'candidat',
+        'cv_name': "cv.pdf",
+        'score': 70,
+    }
+    record.update(fields)
+    return record
+
+def write_legacy_files(directory, count):
+    for i in range(count):
+        old_id = f"analysis_20240101_1200{i:02d}_abc{i}"
+        record = {'id': old_id, 'timestamp': f"2024-01-01T12:00:{i:02d}", 'type': 'candidat', 'score': 50 + i}
+        (directory / f"{old_id}.json").write_text(json.dumps(record), encoding='utf-8')
+
+def test_json_import_runs_once_and_skips_corrupt_files(tmp_path):
+    legacy = tmp_path / "history"
+    legacy.mkdir()
+    write_legacy_files(legacy, 3)
+    (legacy / "analysis_corrompu.json").write_text("{pas du json", encoding='utf-8')
+    
+    store = HistoryStore(tmp_path / "history.db")
+    assert store.migrate_json_files(legacy) == 3
+    assert store.migrate_json_files(legacy) == 0
+    # Redémarrage: le marqueur en base évite un second import
+    assert HistoryStore(tmp_path / "history.db").migrate_json_files(legacy) == 0
+    
+    assert store.count() == 3
+    ids = [summary['id'] for summary in store.list_summaries(limit=10)[0]]
+    assert all(is_analysis_id(analysis_id) for analysis_id in ids)
+    assert store.get(ids[0])['id'] == ids[0]
+
+def test_json_import_ids_are_stable(tmp_path):
+    legacy = tmp_path / "history"
+    legacy.mkdir()
+    write_legacy_files(legacy, 2)
+    
+    first = HistoryStore(tmp_path / "first.db")
+    second = HistoryStore(tmp_path / "second.db")
+    first.migrate_json_files(legacy)
+    second.migrate_json_files(legacy)
+    assert first.list_summaries()[0] == second.list_summaries()[0]
+
+def test_cursor_pagination_covers_every_record_once(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    saved = [make_record(type='recruteur' if i % 3 == 0 else 'candidat') for i in range(25)]
+    for record in saved:
+        store.save(record)
+    
+    pages, cursor = [], None
+    while True:
+        page, cursor = store.list_summaries(limit=10, cursor=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+    
+    assert [len(page) for page in pages] == [10, 10, 5]
+    ids = [summary['id'] for page in pages for summary in page]
+    assert ids == sorted((record['id'] for record in saved), reverse=True)
+    
+    page, cursor = store.list_summaries(limit=5, analysis_type='recruteur', fields=('id', 'type'))
+    assert cursor is not None
+    assert {summary['type'] for summary in page} == {'recruteur'}
+    rest, cursor = store.list_summaries(limit=5, cursor=cursor, analysis_type='recruteur')
+    assert len(page) + len(rest) == 9 and cursor is None
+
+def test_retention_by_count_keeps_most_recent(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    saved = [make_record() for _ in range(12)]
+    for record in saved:
+        store.save(record)
+    
+    assert store.apply_retention(max_records=5, batch_size=2) == 7
+    kept = [summary['id'] for summary in store.list_summaries(limit=20)[0]]
+    assert kept == [record['id'] for record in reversed(saved[-5:])]
+
+def test_retention_by_size(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    for _ in range(10):
+        store.save(make_record(analysis="x" * 1000))
+    limit = store.total_bytes() // 2
+    
+    assert store.apply_retention(max_bytes=limit, batch_size=3) > 0
+    assert store.total_bytes() <= limit
+    assert store.count() >= 4
+
+def test_retention_by_age(tmp_path):
+    store = HistoryStore(tmp_path / "history.db")
+    now = datetime.now()
+    for days in (400, 380, 10, 0):
+        timestamp = (now - timedelta(days=days)).isoformat()
+        store.save(make_record(legacy_analysis_id(f"analysis_{days}", timestamp), timestamp))
+    
+    assert store.apply_retention(older_than=now - timedelta(days=365)) == 2
+    assert store.count() == 2
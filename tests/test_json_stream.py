@@ -0,0 +1,41 @@
+"""
+Tests du parsing incrémental des réponses JSON en flux
+"""
+import json
+import pytest
+from src.json_stream import JSONObjectStreamParser
+
+RESPONSE = (
+    'Voici l\'analyse: {"score_global": 78, '
+    '"synthese": "Profil solide, {API} et [SQL]: \\"senior\\" \\\\ confirmé", '
+    '"experience": {"score": 80, "details": "5 ans, Python"}, '
+    '"points_forts": ["Python, Django", "Docker"]}'
+)
+EXPECTED = json.loads(RESPONSE[RESPONSE.index('{'):])
+
+def feed_all(parser, chunks):
+    members = []
+    for chunk in chunks:
+        members.extend(parser.feed(chunk))
+    return members
+
+@pytest.mark.parametrize("cut", range(1, len(RESPONSE)))
+def test_any_chunk_boundary(cut):
+    parser = JSONObjectStreamParser()
+    members = feed_all(parser, [RESPONSE[:cut], RESPONSE[cut:]])
+    assert dict(members) == EXPECTED
+    assert parser.result == EXPECTED
+    assert parser.finished
+
+def test_one_character_at_a_time():
+    parser = JSONObjectStreamParser()
+    members = feed_all(parser, RESPONSE)
+    assert [key for key, _ in members] == list(EXPECTED)
+    assert parser.result == EXPECTED
+
+def test_member_available_before_end_of_stream():
+    parser = JSONObjectStreamParser()
+    assert parser.feed('{"score_global": 78, "synthese": "Profil, sol') == [('score_global', 78)]
+    assert parser.feed('ide"') == []
+    assert parser.feed('}') == [('synthese', "Profil, solide")]
+    assert parser.feed(' texte après la fin') == []
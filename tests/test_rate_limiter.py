@@ -0,0 +1,149 @@
+"""
+Tests de l'ordonnancement des appels Groq (quotas, retries)
+"""
+import asyncio
+import sys
+import types
+from unittest import mock
+import pytest
+
+# Stub du SDK groq: l'ordonnanceur n'en utilise que les classes d'erreur
+groq_stub = types.ModuleType("groq")
+
+class APIStatusError(Exception):
+    def __init__(self, message: str, status_code: int, headers: dict = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = types.SimpleNamespace(headers=headers or {})
+
+class RateLimitError(APIStatusError):
+    def __init__(self, headers: dict = None):
+        super().__init__("Rate limit", 429, headers)
+
+class APIConnectionError(Exception):
+    pass
+
+class APITimeoutError(APIConnectionError):
+    pass
+
+for error in (APIStatusError, RateLimitError, APIConnectionError, APITimeoutError):
+    setattr(groq_stub, error.__name__, error)
+
+with mock.patch.dict(sys.modules, {"groq": groq_stub}):
+    from src import rate_limiter
+    from src.rate_limiter import WINDOW_SECONDS, RateLimitScheduler
+
+class FakeClock:
+    """Horloge simulée: sleep() avance le temps sans attendre"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "groq", groq_stub)
+    monkeypatch.setattr(rate_limiter, "time", fake)
+    return fake
+
+class FlakyRequest:
+    """Appel simulé qui lève les erreurs données, puis réussit"""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return types.SimpleNamespace(usage=types.SimpleNamespace(total_tokens=100))
+
+def test_requests_over_rpm_wait_for_the_window(clock):
+    scheduler = RateLimitScheduler(rpm_limit=2, tpm_limit=100000)
+    starts = []
+    for _ in range(3):
+        scheduler.execute(lambda: starts.append(clock.now), tokens=10)
+    
+    assert starts[0] == starts[1]
+    assert starts[2] - starts[0] >= WINDOW_SECONDS
+    assert scheduler.stats["requests"] == 3
+    assert scheduler.stats["waited_seconds"] >= WINDOW_SECONDS
+
+def test_tpm_counts_actual_usage(clock):
+    scheduler = RateLimitScheduler(rpm_limit=100, tpm_limit=1000)
+    # Estimation 800, consommation réelle 100: la requête suivante part tout de suite
+    scheduler.execute(FlakyRequest(), tokens=800)
+    scheduler.execute(FlakyRequest(), tokens=800)
+    assert clock.sleeps == []
+    
+    # La fenêtre contient 200 tokens: 900 de plus dépasseraient le quota
+    starts = []
+    scheduler.execute(lambda: starts.append(clock.now), tokens=900)
+    assert starts[0] - 1000.0 >= WINDOW_SECONDS
+
+@pytest.mark.parametrize("status_code", [400, 401, 404, 413])
+def test_client_errors_are_not_retried(clock, status_code):
+    scheduler = RateLimitScheduler(max_retries=5)
+    request = FlakyRequest(APIStatusError("Requête invalide", status_code))
+    
+    with pytest.raises(APIStatusError):
+        scheduler.execute(request, tokens=10)
+    assert request.calls == 1
+    assert scheduler.stats["retries"] == 0
+    assert clock.sleeps == []
+
+def test_transient_errors_are_retried_with_backoff(clock):
+    scheduler = RateLimitScheduler(max_retries=5, base_delay=1.0, max_delay=10.0)
+    request = FlakyRequest(APIStatusError("Indisponible", 503), APITimeoutError("Délai"))
+    
+    scheduler.execute(request, tokens=10)
+    assert request.calls == 3
+    assert scheduler.stats["retries"] == 2
+    assert all(delay <= 10.0 for delay in clock.sleeps)
+
+def test_retries_stop_after_max_retries(clock):
+    scheduler = RateLimitScheduler(max_retries=2)
+    request = FlakyRequest(*[APIConnectionError("Réseau")] * 5)
+    
+    with pytest.raises(APIConnectionError):
+        scheduler.execute(request, tokens=10)
+    assert request.calls == 3
+
+def test_rate_limit_pauses_the_key_for_retry_after(clock):
+    scheduler = RateLimitScheduler(max_retries=3, base_delay=0.5)
+    request = FlakyRequest(RateLimitError({'retry-after': "12"}))
+    
+    scheduler.execute(request, tokens=10)
+    assert request.calls == 2
+    assert scheduler.stats["rate_limited"] == 1
+    assert 12 <= clock.sleeps[0] <= 12.5
+
+def test_rate_limit_pauses_every_request_of_the_key(clock):
+    scheduler = RateLimitScheduler(max_retries=3, base_delay=0.5)
+    delay = scheduler._retry_delay(RateLimitError({'retry-after-ms': "3000"}), attempt=0)
+    
+    reservation, wait = scheduler._try_reserve(10)
+    assert reservation is None
+    assert wait == pytest.approx(delay)
+    assert 3 <= delay <= 3.5
+
+def test_async_client_errors_are_not_retried(clock):
+    scheduler = RateLimitScheduler(max_retries=5)
+    calls = []
+    
+    async def request():
+        calls.append(1)
+        raise APIStatusError("Requête invalide", 422)
+    
+    with pytest.raises(APIStatusError):
+        asyncio.run(scheduler.execute_async(request, tokens=10))
+    assert len(calls) == 1
@@ -0,0 +1,32 @@
+"""
+Tests de la validation des analyses renvoyées par le modèle
+"""
+import pytest
+from src.structured_output import StructuredOutputError, parse_json_response, validate_analysis
+
+def test_unreadable_sub_scores_default_to_zero():
+    analysis = validate_analysis({
+        'score_global': "85/100",
+        'experience': {'score': "N/A"},
+        'formation': {'score': "70 %"},
+    })
+    assert analysis['score_global'] == 85
+    assert analysis['experience']['score'] == 0
+    assert analysis['formation']['score'] == 70
+    assert analysis['competences_techniques']['score'] == 0
+
+def test_unusable_global_score_is_fatal():
+    with pytest.raises(StructuredOutputError):
+        validate_analysis({'score_global': "N/A"})
+def test_repair_keeps_literal_words_inside_strings():
+    response = "{'synthese': 'Profil true to type, null en anglais', 'disponible': true, 'poste': null,}"
+    value = parse_json_response(response, dict)
+    assert value == {
+        'synthese': 'Profil true to type, null en anglais',
+        'disponible': True,
+        'poste': None,
+    }
+
+def test_repair_keeps_commas_inside_strings():
+    value = parse_json_response('{"points_forts": ["Python, ]", "SQL",],}', dict)
+    assert value == {'points_forts': ["Python, ]", "SQL"]}
@@ -0,0 +1,69 @@
+"""
+Tests du nettoyage des textes extraits
+"""
+from src.text_compactor import estimate_tokens, remove_page_artifacts, trim_to_budget
+
+PAGE_1 = "\n".join([
+    "Jean Dupont - Développeur",
+    "Janvier 2019 - Décembre 2021",
+    "Environnement: Python, Django",
+    "Janvier 2022 - Décembre 2023",
+    "Environnement: Python, Django",
+    "Page 1/2",
+    "jean.dupont@mail.fr - CV 2024",
+])
+PAGE_2 = "\n".join([
+    "Jean Dupont - Développeur",
+    "Formation",
+    "Master informatique",
+    "2/2",
+    "jean.dupont@mail.fr - CV 2024",
+])
+
+def test_repeated_body_lines_are_kept():
+    text = remove_page_artifacts(PAGE_1)
+    assert text.count("Environnement: Python, Django") == 2
+    assert "Janvier 2022 - Décembre 2023" in text
+
+def test_headers_and_footers_kept_once():
+    text = remove_page_artifacts(PAGE_1 + "\f" + PAGE_2)
+    assert text.count("Jean Dupont - Développeur") == 1
+    assert text.count("jean.dupont@mail.fr - CV 2024") == 1
+    assert "Page 1/2" not in text and "2/2" not in text
+    assert "Master informatique" in text
+def test_trim_keeps_header_and_stays_within_budget():
+    cv = "\n".join(
+        ["Jean Dupont", "jean.dupont@mail.fr - 06 12 34 56 78", "Expérience professionnelle"]
+        + [f"Développeur Python chez Société {i}: API REST, Docker, PostgreSQL" for i in range(150)]
+        + ["Compétences", "Python, Django, FastAPI, PostgreSQL, Docker, Kubernetes"]
+        + ["Loisirs"] + [f"Randonnée, photographie et voyage numéro {i}" for i in range(50)]
+    )
+    text = trim_to_budget(cv, 1000)
+    assert estimate_tokens(text) <= 1000
+    assert "Jean Dupont" in text
+    assert "Kubernetes" in text
+    assert "Randonnée" not in text
+    assert "[…]" in text
+
+def test_page_numbers_only_removed_at_page_edges():
+    page = "\n".join([
+        "Jean Dupont - Développeur",
+        "Compétences",
+        "Python",
+        "Anglais",
+        "4/5",
+        "Années d'expérience",
+        "12",
+        "Expérience professionnelle",
+        "Développeur Python",
+        "Page {}/2",
+    ])
+    text = remove_page_artifacts(page.format(1) + "\f" + page.format(2))
+    lines = text.split("\n")
+    assert lines.count("4/5") == 2
+    assert lines.count("12") == 2
+    assert "Page 1/2" not in text and "Page 2/2" not in text
+
+def test_text_without_page_breaks_is_unchanged():
+    text = "Langues\nAnglais\n4/5\nAllemand\n3"
+    assert remove_page_artifacts(text) == text
@@ -2,8 +2,8 @@
 Interface Mode Candidat
 """
 import streamlit as st
-from src.pdf_processor import PDFProcessor
-from src.ai_analyzer import CVAnalyzer
+from src.document_extractors import inspect_document_isolated
+from src.client_pool import get_analyzer
 from ui.components import (
     display_score_gauge,
     display_skills_comparison,
@@ -12,8 +12,26 @@ from ui.components import (
     create_download_button,
     display_analysis_card
 )
+from utils.config import DEFAULT_MODEL, ALLOWED_FILE_TYPES, MAX_FILE_SIZE_MB
 from utils.helpers import save_analysis_history
 
+def _inspect_cv(uploaded_cv) -> dict:
+    """
+    Validation, infos et texte d'un upload, obtenus une seule fois dans un
+    processus bridé (le serveur ne parse jamais le fichier) puis conservés
+    entre les reruns
+    """
+    # Identifiant propre à chaque upload: un autre fichier de même nom et de
+    # même taille n'est pas confondu avec le précédent
+    key = uploaded_cv.file_id
+    cached = st.session_state.get('inspected_cv')
+    
+    if not cached or cached[0] != key:
+        with st.spinner("📄 Lecture du document..."):
+            st.session_state.inspected_cv = (key, inspect_document_isolated(uploaded_cv))
+    
+    return st.session_state.inspected_cv[1]
+
 def render_candidate_mode():
     """Interface principale du mode candidat"""
     
@@ -33,17 +51,24 @@ def render_candidate_mode():
     with col1:
         st.markdown("### 📄 Votre CV")
         uploaded_cv = st.file_uploader(
-            "Uploadez votre CV (PDF)",
-            type=['pdf'],
-            help="Format PDF uniquement, max 10 MB"
+            "Uploadez votre CV (PDF, Word ou texte)",
+            type=ALLOWED_FILE_TYPES,
+            help=f"Formats PDF, DOCX ou TXT, max {MAX_FILE_SIZE_MB} MB"
         )
         
         if uploaded_cv:
             st.success(f"✅ Fichier chargé: {uploaded_cv.name}")
             
-            # Informations sur le PDF
-            pdf_info = PDFProcessor.get_pdf_info(uploaded_cv)
-            st.caption(f"📊 {pdf_info.get('num_pages', 0)} page(s)")
+            # Le fichier est lu une fois, puis réutilisé (infos, validation, extraction)
+            inspected_cv = _inspect_cv(uploaded_cv)
+            cv_info = inspected_cv.get('info') or {}
+            
+            if inspected_cv['error']:
+                st.error(f"❌ {inspected_cv['error']}")
+            elif inspected_cv['format'] == "pdf":
+                st.caption(f"📊 {cv_info.get('num_pages', 0)} page(s)")
+            else:
+                st.caption(f"📊 Document {inspected_cv['format'].upper()}")
     
     with col2:
         st.markdown("### 💼 Offre d'Emploi")
@@ -65,22 +90,49 @@ def render_candidate_mode():
             type="primary",
             disabled=not (uploaded_cv and job_offer)
         )
+        full_package = st.checkbox(
+            "⚡ Mode complet (analyse + suggestions + lettre en un seul appel)",
+            help="Le CV et l'offre ne sont envoyés qu'une fois: moins de tokens et d'attente au total"
+        )
     
     if analyze_button:
         with st.spinner("🤖 Analyse en cours... Cela peut prendre 10-20 secondes"):
             try:
-                # Extraction du texte
-                cv_text = PDFProcessor.extract_text(uploaded_cv)
+                # Texte extrait au chargement du fichier
+                if inspected_cv['error']:
+                    st.error(f"❌ {inspected_cv['error']}")
+                    return
+                cv_text = inspected_cv['text']
                 
                 if not cv_text or len(cv_text) < 100:
                     st.error("❌ Le CV semble vide ou illisible. Vérifiez le fichier.")
                     return
                 
                 # Initialiser l'analyseur
-                analyzer = CVAnalyzer(api_key=st.session_state.groq_api_key)
+                analyzer = get_analyzer(
+                    st.session_state.groq_api_key,
+                    st.session_state.get('selected_model', DEFAULT_MODEL)
+                )
                 
-                # Analyse principale
-                analysis = analyzer.analyze_cv_matching(cv_text, job_offer)
+                if full_package:
+                    # Un seul appel pour les trois résultats
+                    package = analyzer.generate_full_package(cv_text, job_offer)
+                    analysis = package['analysis']
+                    st.session_state.suggestions = package['suggestions']
+                    st.session_state.cover_letter = package['cover_letter']
+                else:
+                    # Analyse principale (streaming: le score s'affiche dès sa réception)
+                    progress = st.empty()
+                    analysis = {}
+                    
+                    for section, value in analyzer.stream_cv_matching(cv_text, job_offer):
+                        analysis[section] = value
+                        progress.info(
+                            f"📊 Score global: {analysis.get('score_global', '…')}/100 "
+                            f"— {len(analysis)} section(s) reçue(s)"
+                        )
+                    
+                    progress.empty()
                 
                 # Sauvegarder dans la session
                 st.session_state.current_analysis = analysis
@@ -204,25 +256,38 @@ def render_candidate_mode():
         
         with col1:
             if st.button("✍️ Générer une Lettre de Motivation", use_container_width=True):
-                with st.spinner("Génération de la lettre..."):
-                    try:
-                        analyzer = CVAnalyzer(api_key=st.session_state.groq_api_key)
-                        cover_letter = analyzer.generate_cover_letter(
-                            st.session_state.current_cv_text,
-                            st.session_state.current_job_offer,
-                            analysis
-                        )
-                        
-                        st.session_state.cover_letter = cover_letter
-                        st.success("✅ Lettre générée !")
-                    except Exception as e:
-                        st.error(f"Erreur: {str(e)}")
+                try:
+                    analyzer = get_analyzer(
+                        st.session_state.groq_api_key,
+                        st.session_state.get('selected_model', DEFAULT_MODEL)
+                    )
+                    
+                    # Affichage progressif de la lettre pendant la génération
+                    letter_placeholder = st.empty()
+                    cover_letter = ""
+                    
+                    for delta in analyzer.stream_cover_letter(
+                        st.session_state.current_cv_text,
+                        st.session_state.current_job_offer,
+                        analysis
+                    ):
+                        cover_letter += delta
+                        letter_placeholder.markdown(cover_letter + "▌")
+                    
+                    letter_placeholder.empty()
+                    st.session_state.cover_letter = cover_letter.strip()
+                    st.success("✅ Lettre générée !")
+                except Exception as e:
+                    st.error(f"Erreur: {str(e)}")
         
         with col2:
             if st.button("💡 Obtenir des Suggestions d'Amélioration", use_container_width=True):
                 with st.spinner("Génération des suggestions..."):
                     try:
-                        analyzer = CVAnalyzer(api_key=st.session_state.groq_api_key)
+                        analyzer = get_analyzer(
+                            st.session_state.groq_api_key,
+                            st.session_state.get('selected_model', DEFAULT_MODEL)
+                        )
                         suggestions = analyzer.generate_improvement_suggestions(
                             st.session_state.current_cv_text,
                             st.session_state.current_job_offer,
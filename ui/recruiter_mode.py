@@ -2,8 +2,9 @@
 Interface Mode Recruteur
 """
 import streamlit as st
-from src.pdf_processor import PDFProcessor
-from src.ai_analyzer import CVAnalyzer
+from src.document_extractors import extract_documents
+from src.client_pool import get_analyzer
+from utils.config import DEFAULT_MODEL, CASCADE_TOP_K, TRIAGE_MODEL, ALLOWED_FILE_TYPES, MAX_FILE_SIZE_MB
 from utils.helpers import get_score_color
 
 def render_recruiter_mode():
@@ -32,10 +33,10 @@ def render_recruiter_mode():
     # Upload multiple CVs
     st.markdown("### 📄 CVs des Candidats")
     uploaded_cvs = st.file_uploader(
-        "Uploadez plusieurs CVs (PDF)",
-        type=['pdf'],
+        "Uploadez plusieurs CVs (PDF, Word ou texte)",
+        type=ALLOWED_FILE_TYPES,
         accept_multiple_files=True,
-        help="Sélectionnez plusieurs fichiers PDF"
+        help=f"Sélectionnez plusieurs fichiers PDF, DOCX ou TXT (max {MAX_FILE_SIZE_MB} MB chacun)"
     )
     
     if uploaded_cvs:
@@ -45,6 +46,20 @@ def render_recruiter_mode():
         with st.expander("📋 Liste des CVs"):
             for i, cv in enumerate(uploaded_cvs, 1):
                 st.markdown(f"{i}. {cv.name}")
+        
+        # Mode cascade pour les gros volumes
+        cascade_mode = st.checkbox(
+            "⚡ Mode cascade (tri rapide puis analyse détaillée des meilleurs)",
+            value=len(uploaded_cvs) > CASCADE_TOP_K * 2,
+            help=f"Un petit modèle ({TRIAGE_MODEL}) pré-note tous les CVs; seuls les K meilleurs sont analysés en détail"
+        )
+        if cascade_mode:
+            top_k = st.slider(
+                "Nombre de candidats analysés en détail (K)",
+                min_value=1,
+                max_value=max(1, len(uploaded_cvs)),
+                value=min(CASCADE_TOP_K, len(uploaded_cvs))
+            )
     
     st.markdown("---")
     
@@ -62,27 +77,41 @@ def render_recruiter_mode():
     if analyze_button:
         with st.spinner(f"🤖 Analyse de {len(uploaded_cvs)} CV(s) en cours..."):
             try:
-                # Extraire tous les CVs
-                cvs_data = []
+                # Extraire tous les CVs (en parallèle, un processus par fichier)
+                extracted = []
+                progress = st.progress(0.0, text="📄 Extraction des CVs...")
                 
-                for cv_file in uploaded_cvs:
-                    cv_text = PDFProcessor.extract_text(cv_file)
+                for done, result in enumerate(extract_documents(uploaded_cvs), 1):
+                    progress.progress(done / len(uploaded_cvs), text=f"📄 Extraction des CVs ({done}/{len(uploaded_cvs)})")
                     
-                    if cv_text and len(cv_text) > 50:
-                        cvs_data.append({
-                            'name': cv_file.name,
-                            'text': cv_text
-                        })
+                    if result['error']:
+                        st.warning(f"⚠️ {result['name']}: {result['error']}")
+                    elif result['text'] and len(result['text']) > 50:
+                        extracted.append(result)
                     else:
-                        st.warning(f"⚠️ {cv_file.name} semble vide ou illisible")
+                        st.warning(f"⚠️ {result['name']} semble vide ou illisible")
+                
+                progress.empty()
+                
+                # Ordre d'upload conservé, quel que soit l'ordre de fin d'extraction
+                cvs_data = [
+                    {'name': result['name'], 'text': result['text']}
+                    for result in sorted(extracted, key=lambda r: r['index'])
+                ]
                 
                 if not cvs_data:
                     st.error("❌ Aucun CV valide à analyser")
                     return
                 
                 # Analyser avec l'IA
-                analyzer = CVAnalyzer(api_key=st.session_state.groq_api_key)
-                ranking = analyzer.analyze_multiple_cvs(cvs_data, job_offer)
+                analyzer = get_analyzer(
+                    st.session_state.groq_api_key,
+                    st.session_state.get('selected_model', DEFAULT_MODEL)
+                )
+                if cascade_mode:
+                    ranking = analyzer.analyze_multiple_cvs_cascade(cvs_data, job_offer, top_k=top_k)
+                else:
+                    ranking = analyzer.analyze_multiple_cvs(cvs_data, job_offer)
                 
                 # Sauvegarder
                 st.session_state.recruiter_ranking = ranking
@@ -105,6 +134,16 @@ def render_recruiter_mode():
         if 'synthese' in ranking:
             st.info(f"**📊 Synthèse:** {ranking['synthese']}")
         
+        # Rapport du mode cascade
+        if 'cascade' in ranking:
+            cascade = ranking['cascade']
+            st.caption(
+                f"⚡ Cascade: {cascade['preselectionnes']}/{cascade['candidats']} CVs analysés en détail "
+                f"({cascade['modele_detail']}) après tri par {cascade['modele_tri']} — "
+                f"tri {cascade['duree_tri_s']}s, détail {cascade['duree_detail_s']}s, "
+                f"~{cascade['tokens_economises_estimes']} tokens économisés"
+            )
+        
         st.markdown("---")
         
         # Afficher chaque candidat
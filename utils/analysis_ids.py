@@ -0,0 +1,91 @@
+"""
+Identifiants d'analyse triés dans le temps (format ULID)
+"""
+import hashlib
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Union
+
+# Base32 de Crockford: sans I, L, O, U (pas de confusion à la lecture)
+ENCODING = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ID_LENGTH = 26
+RANDOM_BITS = 80
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+def _reset_after_fork():
+    """Un processus fils repart d'un état vierge (pas de suite partagée avec le parent)"""
+    global _lock, _last_ms
+    _lock = threading.Lock()
+    _last_ms = -1
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _encode(timestamp_ms: int, randomness: int) -> str:
+    value = (timestamp_ms << RANDOM_BITS) | randomness
+    chars = []
+    for _ in range(ID_LENGTH):
+        chars.append(ENCODING[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+def new_analysis_id() -> str:
+    """
+    Nouvel identifiant: 48 bits d'horodatage (ms) + 80 bits aléatoires
+    
+    L'ordre alphabétique des identifiants suit leur ordre de création:
+    dans une même milliseconde, la partie aléatoire du précédent est
+    incrémentée (jamais de doublon dans un processus, même si l'horloge
+    recule). Entre processus, les 80 bits aléatoires rendent une
+    collision négligeable.
+    """
+    global _last_ms, _last_random
+    
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms <= _last_ms:
+            timestamp_ms = _last_ms
+            randomness = _last_random + 1
+            if randomness >> RANDOM_BITS:
+                timestamp_ms += 1
+                randomness = secrets.randbits(RANDOM_BITS)
+        else:
+            randomness = secrets.randbits(RANDOM_BITS)
+        
+        _last_ms, _last_random = timestamp_ms, randomness
+    
+    return _encode(timestamp_ms, randomness)
+
+def is_analysis_id(value: str) -> bool:
+    return len(value) == ID_LENGTH and all(char in ENCODING for char in value)
+
+def _to_ms(moment: Union[str, datetime, None]) -> int:
+    if not moment:
+        return 0
+    try:
+        if isinstance(moment, str):
+            moment = datetime.fromisoformat(moment)
+        return max(0, int(moment.timestamp() * 1000))
+    except (ValueError, OverflowError, OSError):
+        return 0
+
+def id_floor(moment: Union[str, datetime]) -> str:
+    """Plus petit identifiant possible à cette date (borne des requêtes par période)"""
+    return _encode(_to_ms(moment), 0)
+
+def legacy_analysis_id(old_id: str, timestamp: Optional[str]) -> str:
+    """
+    Convertit un ancien identifiant (analysis_AAAAMMJJ_HHMMSS_hash)
+    
+    L'horodatage de l'analyse donne la partie temps; la partie aléatoire
+    est dérivée de l'ancien identifiant, si bien que la conversion donne
+    toujours le même résultat (import des fichiers JSON idempotent).
+    """
+    digest = hashlib.sha256(old_id.encode("utf-8")).digest()
+    return _encode(_to_ms(timestamp), int.from_bytes(digest[:RANDOM_BITS // 8], "big"))
\ No newline at end of file
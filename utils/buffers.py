@@ -0,0 +1,139 @@
+"""
+Tampons binaires sans copie: memoryview, fichiers mappés et mémoire partagée
+"""
+import io
+import mmap
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Optional, Union
+
+Buffer = Union[bytes, memoryview]
+
+class BufferStream(io.RawIOBase):
+    """
+    Flux en lecture seule sur un tampon existant (bytes, memoryview, mmap)
+    
+    Contrairement à io.BytesIO(memoryview), le contenu n'est pas copié:
+    PyPDF2, pdfplumber et zipfile lisent directement dans le tampon.
+    """
+    
+    def __init__(self, buffer: Buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, target) -> int:
+        chunk = self._view[self._position:self._position + len(target)]
+        target[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+    
+    def readall(self) -> bytes:
+        chunk = bytes(self._view[self._position:])
+        self._position = len(self._view)
+        return chunk
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+    
+    def tell(self) -> int:
+        return self._position
+
+def map_file(path: Union[str, Path]) -> memoryview:
+    """
+    Projette un fichier en mémoire (lecture seule)
+    
+    Les pages ne sont chargées qu'à la lecture et restent partagées avec le
+    cache du système: aucun octet n'est copié dans le tas Python.
+    """
+    with open(path, 'rb') as f:
+        if Path(path).stat().st_size == 0:
+            return memoryview(b"")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)
+
+def read_buffer(source) -> tuple[Buffer, Optional[str], Optional[str], Optional[str]]:
+    """
+    Contenu d'un fichier sans copie quand c'est possible
+    
+    Accepte octets, memoryview, chemin (fichier mappé), UploadedFile
+    Streamlit ou tout flux binaire, et un objet exposant `data`
+    (ParsedPDF).
+    
+    Returns:
+        tuple: (tampon, nom, type MIME, chemin du fichier ou None)
+    """
+    if isinstance(source, (bytes, memoryview)):
+        return source, None, None, None
+    if isinstance(source, (bytearray, mmap.mmap)):
+        return memoryview(source), None, None, None
+    if isinstance(source, (str, Path)):
+        return map_file(source), Path(source).name, None, str(source)
+    if hasattr(source, 'data'):
+        return source.data, source.name, None, getattr(source, 'path', None)
+    
+    name = getattr(source, 'name', None)
+    mime_type = getattr(source, 'type', None)
+    if hasattr(source, 'getvalue'):
+        # UploadedFile / BytesIO: getvalue() rend l'objet bytes partagé sans
+        # copie, alors que getbuffer() copierait le tampon encore référencé
+        # par Streamlit (et bloquerait le flux tant que la vue existe)
+        return source.getvalue(), name, mime_type, None
+    
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    return data, name, mime_type, None
+
+def share_buffer(buffer: Buffer) -> shared_memory.SharedMemory:
+    """
+    Copie unique du tampon dans un segment de mémoire partagée
+    
+    Le processus enfant l'ouvre par son nom au lieu de recevoir une copie
+    sérialisée (pickle). L'appelant doit appeler close() puis unlink().
+    """
+    view = memoryview(buffer).cast('B')
+    segment = shared_memory.SharedMemory(create=True, size=max(1, len(view)))
+    segment.buf[:len(view)] = view
+    return segment
+
+@contextmanager
+def open_handle(handle: tuple):
+    """
+    Ouvre, dans le processus enfant, un tampon transmis par référence
+    
+    Args:
+        handle: ('shm', nom, taille) ou ('file', chemin)
+    
+    Yields:
+        memoryview: Contenu du document
+    """
+    if handle[0] == "file":
+        view = map_file(handle[1])
+        segment = None
+    else:
+        segment = shared_memory.SharedMemory(name=handle[1])
+        view = segment.buf[:handle[2]]
+    
+    try:
+        yield view
+    finally:
+        try:
+            view.release()
+            if segment is not None:
+                segment.close()
+        except BufferError:
+            # Des vues restent référencées (parseur): libérées à la sortie du processus
+            pass
\ No newline at end of file
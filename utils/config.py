@@ -14,9 +14,22 @@ DATA_DIR = BASE_DIR / "data"
 UPLOADS_DIR = DATA_DIR / "uploads"
 HISTORY_DIR = DATA_DIR / "history"
 EXPORTS_DIR = DATA_DIR / "exports"
+CACHE_DIR = DATA_DIR / "cache"
+HISTORY_DB_PATH = DATA_DIR / "history.db"
+# Analyses affichées par page dans l'historique de la barre latérale
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "5"))
+# Rétention de l'historique (0 = pas de limite), appliquée en arrière-plan
+HISTORY_MAX_RECORDS = int(os.getenv("HISTORY_MAX_RECORDS", "5000"))
+HISTORY_MAX_MB = int(os.getenv("HISTORY_MAX_MB", "200"))
+HISTORY_MAX_AGE_DAYS = int(os.getenv("HISTORY_MAX_AGE_DAYS", "365"))
+# Délai minimal entre deux passes de rétention (secondes)
+HISTORY_RETENTION_INTERVAL = float(os.getenv("HISTORY_RETENTION_INTERVAL", "300"))
+# Compression zlib des analyses enregistrées; attente du verrou d'écriture (secondes)
+HISTORY_COMPRESS = os.getenv("HISTORY_COMPRESS", "true").lower() == "true"
+HISTORY_BUSY_TIMEOUT = float(os.getenv("HISTORY_BUSY_TIMEOUT", "10"))
 
 # Créer les dossiers s'ils n'existent pas
-for directory in [DATA_DIR, UPLOADS_DIR, HISTORY_DIR, EXPORTS_DIR]:
+for directory in [DATA_DIR, UPLOADS_DIR, HISTORY_DIR, EXPORTS_DIR, CACHE_DIR]:
     directory.mkdir(exist_ok=True, parents=True)
 
 # Configuration API
@@ -25,10 +38,63 @@ DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "llama-3.3-70b-versatile")
 TEMPERATURE = float(os.getenv("TEMPERATURE", "0.3"))
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "4000"))
 
+# Mode recruteur: nombre d'appels IA simultanés (un appel par CV)
+MAX_PARALLEL_REQUESTS = int(os.getenv("MAX_PARALLEL_REQUESTS", "8"))
+# Nombre de candidats transmis à l'étape de synthèse comparative
+SYNTHESIS_TOP_N = int(os.getenv("SYNTHESIS_TOP_N", "10"))
+# Mode cascade: tri rapide de tous les CVs, analyse détaillée des K meilleurs
+TRIAGE_MODEL = os.getenv("TRIAGE_MODEL", "llama-3.1-8b-instant")
+CASCADE_TOP_K = int(os.getenv("CASCADE_TOP_K", "5"))
+TRIAGE_CV_TOKEN_BUDGET = int(os.getenv("TRIAGE_CV_TOKEN_BUDGET", "1500"))
+# Délai maximal d'un appel IA (secondes) pour l'analyseur asynchrone
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "60"))
+# Quotas Groq par clé et par modèle (voir console.groq.com/settings/limits)
+GROQ_RPM_LIMIT = int(os.getenv("GROQ_RPM_LIMIT", "30"))
+GROQ_TPM_LIMIT = int(os.getenv("GROQ_TPM_LIMIT", "12000"))
+# Nouvelles tentatives sur 429 / erreurs serveur / réseau
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1.0"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "60"))
+# Durée pendant laquelle une clé API validée n'est pas re-testée (secondes)
+API_KEY_VALIDATION_TTL = int(os.getenv("API_KEY_VALIDATION_TTL", "3600"))
+
+# Cache des réponses IA (clé = modèle + prompts + paramètres d'échantillonnage)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "200"))
+# Au-delà de cette température, les réponses sont volontairement variées (lettres)
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.5"))
+
+# Budgets de tokens (estimés localement) par texte envoyé au modèle
+CV_TOKEN_BUDGET = int(os.getenv("CV_TOKEN_BUDGET", "6000"))
+JOB_OFFER_TOKEN_BUDGET = int(os.getenv("JOB_OFFER_TOKEN_BUDGET", "2000"))
+
+# Extraction PDF en lot (mode recruteur): processus parallèles et délai par fichier
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_EXTRACTION_TIMEOUT = float(os.getenv("PDF_EXTRACTION_TIMEOUT", "30"))
+# Garde-fous contre les PDFs hostiles ou démesurés (MAX_FILE_SIZE_MB: voir plus bas)
+MAX_PDF_PAGE_COUNT = int(os.getenv("MAX_PDF_PAGE_COUNT", "50"))
+PDF_WORKER_MEMORY_MB = int(os.getenv("PDF_WORKER_MEMORY_MB", "512"))
+PDF_PAGE_CPU_SECONDS = float(os.getenv("PDF_PAGE_CPU_SECONDS", "5"))
+# Méthode d'extraction: 'adaptive' (PyPDF2, pdfplumber pour les pages mal extraites),
+# 'columns' (CVs multi-colonnes), 'pdfplumber' ou 'pypdf'
+PDF_EXTRACTION_METHOD = os.getenv("PDF_EXTRACTION_METHOD", "adaptive")
+# Score de qualité (0-1) en dessous duquel une page est ré-extraite avec pdfplumber
+PDF_PAGE_QUALITY_THRESHOLD = float(os.getenv("PDF_PAGE_QUALITY_THRESHOLD", "0.7"))
+# Limites d'extraction: pages lues et caractères conservés par document
+# (un "CV" de 300 pages ne doit ni saturer la mémoire ni le prompt)
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "20"))
+MAX_EXTRACTED_CHARS = int(os.getenv("MAX_EXTRACTED_CHARS", "50000"))
+# Cache du texte extrait (clé = SHA-256 du fichier + méthode + version de l'extracteur)
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_MAX_MB = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "100"))
+
 # Configuration Application
 APP_TITLE = os.getenv("APP_TITLE", "CV AI Analyzer")
 MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
-ALLOWED_FILE_TYPES = ["pdf"]
+ALLOWED_FILE_TYPES = ["pdf", "docx", "txt"]
+# Taille décompressée maximale d'un DOCX (archive ZIP: protection contre les bombes)
+DOCX_MAX_UNCOMPRESSED_MB = int(os.getenv("DOCX_MAX_UNCOMPRESSED_MB", "50"))
 
 # Modèles disponibles
 AVAILABLE_MODELS = {
@@ -37,6 +103,22 @@ AVAILABLE_MODELS = {
     "Mixtral 8x7B": "mixtral-8x7b-32768",
 }
 
+# Modèles acceptant le mode JSON (response_format={"type": "json_object"})
+JSON_MODE_MODELS = {
+    "llama-3.1-8b-instant",
+    "llama-3.3-70b-versatile",
+    "llama-3.1-70b-versatile",
+    "mixtral-8x7b-32768",
+}
+
+# Fenêtre de contexte des modèles (tokens)
+MODEL_CONTEXT_TOKENS = {
+    "llama-3.1-8b-instant": 128000,
+    "llama-3.3-70b-versatile": 128000,
+    "llama-3.1-70b-versatile": 128000,
+    "mixtral-8x7b-32768": 32768,
+}
+
 # Scores de matching
 SCORE_THRESHOLDS = {
     "excellent": 80,
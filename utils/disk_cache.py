@@ -0,0 +1,169 @@
+"""
+Cache clé/valeur persistant sur disque (un fichier par entrée)
+"""
+import json
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+class DiskCache:
+    """
+    Cache texte sur disque avec expiration (TTL) et éviction LRU par taille
+    
+    Chaque entrée est un petit fichier JSON nommé d'après sa clé (hash
+    SHA-256). L'heure de modification sert d'horodatage LRU: elle est
+    rafraîchie à chaque lecture réussie. Les écritures passent par un
+    fichier temporaire puis un renommage atomique, ce qui rend le cache
+    sûr entre threads et entre processus.
+    """
+    
+    def __init__(self, directory: Path, max_bytes: int,
+                 ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            directory: Dossier de stockage
+            max_bytes: Taille totale maximale avant éviction
+            ttl_seconds: Durée de vie d'une entrée (None = illimitée)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(exist_ok=True, parents=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None
+    
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hash SHA-256 stable des éléments de la clé"""
+        payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Retourne la valeur en cache ou None"""
+        path = self._path(key)
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        if self.ttl_seconds is not None and time.time() - entry.get('created', 0) > self.ttl_seconds:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        with self._lock:
+            self.hits += 1
+        return entry.get('value')
+    
+    def set(self, key: str, value: str):
+        """Enregistre une valeur (écriture atomique)"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        
+        data = json.dumps({'created': time.time(), 'value': value}, ensure_ascii=False)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            previous_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data.encode('utf-8')) - previous_size
+        self._evict_if_needed()
+    
+    def delete(self, key: str):
+        """Supprime une entrée (sans effet si elle n'existe pas)"""
+        self._remove(self._path(key))
+    
+    def _remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+    
+    def _entries(self) -> list:
+        """Liste (mtime, taille, chemin) de toutes les entrées"""
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+    
+    def _evict_if_needed(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            if self._total_bytes <= self.max_bytes:
+                return
+            
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            
+            # Descendre à 90% de la limite pour ne pas évincer à chaque écriture
+            target = self.max_bytes * 0.9
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+            
+            self._total_bytes = total
+    
+    def clear(self):
+        """Vide le cache"""
+        for _, _, path in self._entries():
+            self._remove(path)
+    
+    def stats(self) -> dict:
+        """Compteurs d'utilisation du cache"""
+        entries = self._entries()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries)
+        }
\ No newline at end of file
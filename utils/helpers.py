@@ -1,11 +1,25 @@
 """
 Fonctions utilitaires
 """
-import json
-import hashlib
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from utils.config import HISTORY_DIR, SCORE_THRESHOLDS, SCORE_COLORS
+from typing import Optional
+from utils.config import (
+    HISTORY_DIR,
+    HISTORY_DB_PATH,
+    HISTORY_MAX_RECORDS,
+    HISTORY_MAX_MB,
+    HISTORY_MAX_AGE_DAYS,
+    HISTORY_RETENTION_INTERVAL,
+    HISTORY_COMPRESS,
+    HISTORY_BUSY_TIMEOUT,
+    SCORE_THRESHOLDS,
+    SCORE_COLORS
+)
+from utils.analysis_ids import new_analysis_id
+from utils.history_store import HistoryStore
 
 def get_score_category(score: int) -> str:
     """Retourne la catégorie du score"""
@@ -24,10 +38,24 @@ def get_score_color(score: int) -> str:
     return SCORE_COLORS[category]
 
 def generate_analysis_id() -> str:
-    """Génère un ID unique pour l'analyse"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    random_hash = hashlib.md5(str(datetime.now()).encode()).hexdigest()[:8]
-    return f"analysis_{timestamp}_{random_hash}"
+    """Génère un ID unique pour l'analyse, trié par date de création"""
+    return new_analysis_id()
+
+_history_store = None
+_history_store_lock = threading.Lock()
+
+def get_history_store() -> HistoryStore:
+    """Base d'historique partagée (anciens fichiers JSON importés au premier accès)"""
+    global _history_store
+    with _history_store_lock:
+        if _history_store is None:
+            _history_store = HistoryStore(
+                HISTORY_DB_PATH,
+                compress=HISTORY_COMPRESS,
+                busy_timeout=HISTORY_BUSY_TIMEOUT
+            )
+            _history_store.migrate_json_files(HISTORY_DIR)
+    return _history_store
 
 def save_analysis_history(analysis_data: dict) -> str:
     """Sauvegarde l'historique d'une analyse"""
@@ -35,43 +63,115 @@ def save_analysis_history(analysis_data: dict) -> str:
     analysis_data['id'] = analysis_id
     analysis_data['timestamp'] = datetime.now().isoformat()
     
-    filepath = HISTORY_DIR / f"{analysis_id}.json"
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(analysis_data, f, ensure_ascii=False, indent=2)
+    get_history_store().save(analysis_data)
+    schedule_history_retention()
     
     return analysis_id
 
-def load_analysis_history() -> list:
-    """Charge l'historique des analyses"""
-    history = []
-    
-    if not HISTORY_DIR.exists():
-        return history
+def load_analysis_history(limit: Optional[int] = None) -> list:
+    """Charge l'historique complet des analyses (préférer list_analysis_summaries)"""
+    return get_history_store().list_full(limit)
+
+def count_analyses(analysis_type: Optional[str] = None) -> int:
+    """Nombre d'analyses sauvegardées (sans les charger)"""
+    return get_history_store().count(analysis_type)
+
+def list_analysis_summaries(limit: int = 5, cursor: Optional[str] = None,
+                            analysis_type: Optional[str] = None,
+                            fields: Optional[tuple] = None) -> tuple[list, Optional[str]]:
+    """
+    Une page d'analyses récentes, sans leur contenu complet
     
-    for filepath in sorted(HISTORY_DIR.glob("*.json"), reverse=True):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                history.append(data)
-        except Exception as e:
-            print(f"Erreur lors du chargement de {filepath}: {e}")
+    Args:
+        limit: Taille de la page
+        cursor: Curseur de la page suivante renvoyé par l'appel précédent
+        analysis_type: 'candidat' ou 'recruteur' (None = tous)
+        fields: Champs à renvoyer (défaut: id, date, type, nom du CV, score)
     
-    return history
+    Returns:
+        tuple: (résumés, curseur de la page suivante ou None)
+    """
+    store = get_history_store()
+    if fields is None:
+        return store.list_summaries(limit, cursor, analysis_type)
+    return store.list_summaries(limit, cursor, analysis_type, tuple(fields))
+
+def get_analysis(analysis_id: str) -> Optional[dict]:
+    """Analyse complète d'un enregistrement"""
+    return get_history_store().get(analysis_id)
 
 def delete_analysis(analysis_id: str) -> bool:
     """Supprime une analyse de l'historique"""
-    filepath = HISTORY_DIR / f"{analysis_id}.json"
-    
     try:
-        if filepath.exists():
-            filepath.unlink()
-            return True
+        return get_history_store().delete(analysis_id)
     except Exception as e:
         print(f"Erreur lors de la suppression: {e}")
     
     return False
 
+def clear_analysis_history(older_than_days: Optional[float] = None,
+                           analysis_type: Optional[str] = None) -> int:
+    """
+    Supprime en une fois tout ou partie de l'historique
+    
+    Args:
+        older_than_days: Ne supprime que les analyses plus anciennes (None = toutes)
+        analysis_type: Ne supprime que ce type ('candidat', 'recruteur')
+    
+    Returns:
+        int: Nombre d'analyses supprimées
+    """
+    older_than = None
+    if older_than_days is not None:
+        older_than = datetime.now() - timedelta(days=older_than_days)
+    
+    try:
+        return get_history_store().delete_many(older_than, analysis_type)
+    except Exception as e:
+        print(f"Erreur lors de la suppression: {e}")
+    
+    return 0
+
+def enforce_history_retention() -> int:
+    """Applique les limites HISTORY_MAX_* (nombre, taille, ancienneté)"""
+    older_than = None
+    if HISTORY_MAX_AGE_DAYS > 0:
+        older_than = datetime.now() - timedelta(days=HISTORY_MAX_AGE_DAYS)
+    
+    return get_history_store().apply_retention(
+        max_records=HISTORY_MAX_RECORDS or None,
+        max_bytes=HISTORY_MAX_MB * 1024 * 1024 or None,
+        older_than=older_than
+    )
+
+_retention_lock = threading.Lock()
+_last_retention = 0.0
+
+def schedule_history_retention():
+    """
+    Lance la rétention dans un thread d'arrière-plan
+    
+    Au plus une passe à la fois et une par HISTORY_RETENTION_INTERVAL:
+    la sauvegarde d'une analyse n'attend jamais la purge.
+    """
+    global _last_retention
+    
+    if time.monotonic() - _last_retention < HISTORY_RETENTION_INTERVAL:
+        return
+    if not _retention_lock.acquire(blocking=False):
+        return
+    _last_retention = time.monotonic()
+    
+    def run():
+        try:
+            enforce_history_retention()
+        except Exception as e:
+            print(f"Erreur lors de la rétention de l'historique: {e}")
+        finally:
+            _retention_lock.release()
+    
+    threading.Thread(target=run, name="history-retention", daemon=True).start()
+
 def format_date(iso_date: str) -> str:
     """Formate une date ISO en format lisible"""
     try:
@@ -0,0 +1,372 @@
+"""
+Historique des analyses dans une base SQLite indexée
+"""
+import json
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from utils.analysis_ids import id_floor, is_analysis_id, legacy_analysis_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    type TEXT,
+    cv_name TEXT,
+    score INTEGER,
+    payload TEXT NOT NULL
+);
+DROP INDEX IF EXISTS idx_analyses_timestamp;
+DROP INDEX IF EXISTS idx_analyses_recent;
+DROP INDEX IF EXISTS idx_analyses_type;
+CREATE INDEX IF NOT EXISTS idx_analyses_type_id ON analyses (type, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_score ON analyses (score);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# En dessous de cette taille, la compression ne fait rien gagner
+COMPRESS_MIN_BYTES = 512
+
+# Colonnes renvoyées par les listes (sans le contenu complet de l'analyse)
+SUMMARY_FIELDS = ("id", "timestamp", "type", "cv_name", "score")
+
+class HistoryStore:
+    """
+    Historique persistant: une ligne par analyse
+    
+    Les champs affichés dans les listes (date, type, nom, score) sont des
+    colonnes indexées; l'analyse complète n'est lue que pour un
+    enregistrement précis. Compter ou lister les dernières analyses ne
+    coûte donc plus la lecture de tout l'historique.
+    
+    Les identifiants (voir utils.analysis_ids) sont triés dans le temps:
+    la clé primaire sert directement d'index pour les listes récentes,
+    la pagination et les purges par ancienneté.
+    
+    Plusieurs processus (workers Streamlit) peuvent écrire en même temps:
+    la base est en mode WAL (les lectures ne bloquent pas les écritures),
+    chaque écriture prend le verrou d'écriture dès son début (BEGIN
+    IMMEDIATE) et attend qu'il se libère au lieu d'échouer. Une analyse
+    est enregistrée en une transaction: un arrêt brutal ne laisse jamais
+    d'enregistrement à moitié écrit.
+    """
+    
+    def __init__(self, db_path: Path, compress: bool = False, busy_timeout: float = 5.0):
+        """
+        Args:
+            db_path: Fichier de la base SQLite
+            compress: Compresse (zlib) les analyses volumineuses
+            busy_timeout: Attente maximale du verrou d'écriture (secondes)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True, parents=True)
+        self.compress = compress
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            conn.execute("BEGIN IMMEDIATE")
+            self._add_size_column(conn)
+            self._upgrade_legacy_ids(conn)
+    
+    @staticmethod
+    def _add_size_column(conn):
+        """Bases créées avant le suivi de taille: colonne ajoutée et remplie une fois"""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(analyses)")}
+        if "size_bytes" not in columns:
+            conn.execute("ALTER TABLE analyses ADD COLUMN size_bytes INTEGER")
+            conn.execute("UPDATE analyses SET size_bytes = length(CAST(payload AS BLOB))")
+    
+    @staticmethod
+    def _upgrade_legacy_ids(conn):
+        """Anciens identifiants (analysis_AAAAMMJJ_...) convertis une seule fois"""
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'ids_upgraded'").fetchone():
+            return
+        
+        rows = conn.execute("SELECT id, timestamp, payload FROM analyses").fetchall()
+        for row in rows:
+            if is_analysis_id(row["id"]):
+                continue
+            new_id = legacy_analysis_id(row["id"], row["timestamp"])
+            record = _decode(row["payload"])
+            record['id'] = new_id
+            payload = _encode(record, compress=False)
+            conn.execute(
+                "UPDATE OR REPLACE analyses SET id = ?, payload = ?, size_bytes = ? WHERE id = ?",
+                (new_id, payload, len(payload), row["id"])
+            )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('ids_upgraded', '1')")
+    
+    @contextmanager
+    def _connect(self):
+        """Connexion courte par opération (sûre entre threads Streamlit)"""
+        # IMMEDIATE: verrou d'écriture pris au début de la transaction, pas
+        # à la première écriture (évite les interblocages entre processus)
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level="IMMEDIATE")
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def save(self, record: dict):
+        """Enregistre (ou remplace) une analyse; `id` et `timestamp` requis"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses (id, timestamp, type, cv_name, score, payload, size_bytes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                _row(record, self.compress)
+            )
+    
+    def count(self, analysis_type: Optional[str] = None) -> int:
+        with self._connect() as conn:
+            if analysis_type:
+                query = conn.execute("SELECT COUNT(*) FROM analyses WHERE type = ?", (analysis_type,))
+            else:
+                query = conn.execute("SELECT COUNT(*) FROM analyses")
+            return query.fetchone()[0]
+    
+    def list_summaries(self, limit: int = 20, cursor: Optional[str] = None,
+                       analysis_type: Optional[str] = None,
+                       fields: tuple = SUMMARY_FIELDS) -> tuple[list, Optional[str]]:
+        """
+        Une page de résumés, du plus récent au plus ancien
+        
+        La pagination se fait par curseur (identifiant du dernier élément
+        de la page précédente) et non par OFFSET: chaque page est une
+        lecture d'index de `limit` lignes, quelle que soit sa position
+        dans l'historique.
+        
+        Args:
+            limit: Taille de la page
+            cursor: Curseur renvoyé par la page précédente (None = début)
+            analysis_type: Filtre sur le type ('candidat', 'recruteur')
+            fields: Colonnes à renvoyer (parmi SUMMARY_FIELDS)
+        
+        Returns:
+            tuple: (résumés, curseur de la page suivante ou None)
+        """
+        invalid = set(fields) - set(SUMMARY_FIELDS)
+        if invalid:
+            raise ValueError(f"Champs inconnus: {', '.join(sorted(invalid))}")
+        
+        # id sert au curseur, même s'il n'est pas demandé
+        columns = list(dict.fromkeys(("id",) + tuple(fields)))
+        conditions, params = [], []
+        if analysis_type:
+            conditions.append("type = ?")
+            params.append(analysis_type)
+        if cursor:
+            conditions.append("id < ?")
+            params.append(cursor)
+        
+        query = f"SELECT {', '.join(columns)} FROM analyses"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit + 1)
+        
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        page = rows[:limit]
+        next_cursor = page[-1]['id'] if len(rows) > limit else None
+        return [{field: row[field] for field in fields} for row in page], next_cursor
+    
+    def get(self, analysis_id: str) -> Optional[dict]:
+        """Enregistrement complet (avec l'analyse) ou None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+        return _decode(row["payload"]) if row else None
+    
+    def list_full(self, limit: Optional[int] = None) -> list:
+        """Enregistrements complets du plus récent au plus ancien"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM analyses ORDER BY id DESC LIMIT ?",
+                (-1 if limit is None else limit,)
+            ).fetchall()
+        return [_decode(row["payload"]) for row in rows]
+    
+    def delete(self, analysis_id: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM analyses WHERE id = ?", (analysis_id,)).rowcount > 0
+    
+    def delete_many(self, older_than: Optional[datetime] = None,
+                    analysis_type: Optional[str] = None) -> int:
+        """
+        Suppression groupée en une seule requête
+        
+        Args:
+            older_than: Supprime les analyses antérieures à cette date
+            analysis_type: Ne supprime que ce type
+        
+        Sans critère, tout l'historique est effacé.
+        
+        Returns:
+            int: Nombre d'analyses supprimées
+        """
+        conditions, params = [], []
+        if older_than:
+            conditions.append("id < ?")
+            params.append(id_floor(older_than))
+        if analysis_type:
+            conditions.append("type = ?")
+            params.append(analysis_type)
+        
+        query = "DELETE FROM analyses"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        with self._connect() as conn:
+            return conn.execute(query, params).rowcount
+    
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM analyses").fetchone()[0]
+    
+    def _delete_oldest(self, condition: str, params: list, limit: int) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                f"DELETE FROM analyses WHERE id IN ("
+                f"SELECT id FROM analyses WHERE {condition} ORDER BY id LIMIT ?)",
+                params + [limit]
+            ).rowcount
+    
+    def apply_retention(self, max_records: Optional[int] = None, max_bytes: Optional[int] = None,
+                        older_than: Optional[datetime] = None, batch_size: int = 500) -> int:
+        """
+        Applique la politique de rétention, des plus anciennes aux plus récentes
+        
+        Les suppressions se font par lots de `batch_size` lignes, chacun dans
+        sa propre transaction: la base n'est jamais verrouillée longtemps,
+        même pour purger des dizaines de milliers d'analyses.
+        
+        Args:
+            max_records: Nombre maximal d'analyses conservées
+            max_bytes: Taille cumulée maximale des analyses
+            older_than: Date avant laquelle une analyse expire
+        
+        Returns:
+            int: Nombre d'analyses supprimées
+        """
+        deleted = 0
+        
+        if older_than:
+            while True:
+                count = self._delete_oldest("id < ?", [id_floor(older_than)], batch_size)
+                deleted += count
+                if count < batch_size:
+                    break
+        
+        if max_records is not None:
+            excess = self.count() - max_records
+            while excess > 0:
+                count = self._delete_oldest("1", [], min(excess, batch_size))
+                if not count:
+                    break
+                deleted += count
+                excess -= count
+        
+        if max_bytes is not None:
+            excess = self.total_bytes() - max_bytes
+            while excess > 0:
+                with self._connect() as conn:
+                    rows = conn.execute(
+                        "SELECT size_bytes FROM analyses ORDER BY id LIMIT ?",
+                        (batch_size,)
+                    ).fetchall()
+                
+                # Juste assez de lignes pour repasser sous la limite
+                freed, cutoff = 0, 0
+                for cutoff, row in enumerate(rows, 1):
+                    freed += row["size_bytes"] or 0
+                    if freed >= excess:
+                        break
+                if not cutoff:
+                    break
+                deleted += self._delete_oldest("1", [], cutoff)
+                excess -= freed
+        
+        return deleted
+    
+    def migrate_json_files(self, directory: Path) -> int:
+        """
+        Importe une seule fois les anciens fichiers analysis_*.json
+        
+        Les fichiers sont laissés en place; un marqueur en base évite de
+        les relire aux démarrages suivants. Le marqueur est relu sous le
+        verrou d'écriture: si plusieurs processus démarrent ensemble, un
+        seul importe les fichiers.
+        
+        Returns:
+            int: Nombre d'analyses importées
+        """
+        with self._lock:
+            with self._connect() as conn:
+                done = conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if done:
+                return 0
+            
+            rows = []
+            for filepath in Path(directory).glob("analysis_*.json"):
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        record = json.load(f)
+                    record.setdefault('id', filepath.stem)
+                    record.setdefault('timestamp', "")
+                    if not is_analysis_id(record['id']):
+                        record['id'] = legacy_analysis_id(record['id'], record['timestamp'])
+                    rows.append(_row(record, self.compress))
+                except Exception as e:
+                    print(f"Erreur lors de la migration de {filepath}: {e}")
+            
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone():
+                    return 0
+                conn.executemany(
+                    "INSERT OR IGNORE INTO analyses (id, timestamp, type, cv_name, score, payload, size_bytes) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', '1')")
+            
+            return len(rows)
+
+def _encode(record: dict, compress: bool):
+    """JSON compact (texte), ou compressé (BLOB zlib) s'il est volumineux"""
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    if compress and len(payload) >= COMPRESS_MIN_BYTES:
+        return zlib.compress(payload.encode('utf-8'))
+    return payload
+
+def _decode(payload) -> dict:
+    """Lit les deux encodages (les anciennes lignes restent en texte)"""
+    if isinstance(payload, bytes):
+        payload = zlib.decompress(payload)
+    return json.loads(payload)
+
+def _row(record: dict, compress: bool = False) -> tuple:
+    score = record.get('score')
+    payload = _encode(record, compress)
+    return (
+        record['id'],
+        record['timestamp'],
+        record.get('type'),
+        record.get('cv_name'),
+        int(score) if isinstance(score, (int, float)) else None,
+        payload,
+        len(payload) if isinstance(payload, bytes) else len(payload.encode('utf-8'))
+    )
\ No newline at end of file